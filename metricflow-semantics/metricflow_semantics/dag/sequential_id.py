@@ -34,13 +34,13 @@ class SequentialIdGenerator:
 
     @classmethod
     def create_next_id(cls, id_prefix: IdPrefix) -> SequentialId:  # noqa: D102
+        # This is called for every node in the dataflow / SQL plans, so keep the locked section to a lookup and a store.
         with cls._state_lock:
-            if id_prefix not in cls._prefix_to_next_value:
-                cls._prefix_to_next_value[id_prefix] = cls._default_start_value
-            index = cls._prefix_to_next_value[id_prefix]
-            cls._prefix_to_next_value[id_prefix] = index + 1
+            prefix_to_next_value = cls._prefix_to_next_value
+            index = prefix_to_next_value.get(id_prefix, cls._default_start_value)
+            prefix_to_next_value[id_prefix] = index + 1
 
-            return SequentialId(id_prefix, index)
+        return SequentialId(id_prefix, index)
 
     @classmethod
     def reset(cls, default_start_value: int = 0) -> None:
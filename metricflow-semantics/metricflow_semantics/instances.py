@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Generic, List, Tuple, TypeVar
+from typing import Generic, List, Sequence, Set, Tuple, TypeVar
 
 from dbt_semantic_interfaces.dataclass_serialization import SerializableDataclass
 from dbt_semantic_interfaces.references import MetricModelReference, SemanticModelElementReference
@@ -159,7 +159,7 @@ class InstanceSet(SerializableDataclass):
         return transform_function.transform(self)
 
     @staticmethod
-    def merge(instance_sets: List[InstanceSet]) -> InstanceSet:
+    def merge(instance_sets: Sequence[InstanceSet]) -> InstanceSet:
         """Combine all instances from all instances into a single instance set.
 
         Instances will be de-duped based on their spec.
@@ -172,27 +172,43 @@ class InstanceSet(SerializableDataclass):
         metric_instances: List[MetricInstance] = []
         metadata_instances: List[MetadataInstance] = []
 
+        # Track the specs that have been added so far so that the de-duplication check is a lookup.
+        measure_specs: Set[MeasureSpec] = set()
+        dimension_specs: Set[DimensionSpec] = set()
+        time_dimension_specs: Set[TimeDimensionSpec] = set()
+        entity_specs: Set[EntitySpec] = set()
+        group_by_metric_specs: Set[GroupByMetricSpec] = set()
+        metric_specs: Set[MetricSpec] = set()
+        metadata_specs: Set[MetadataSpec] = set()
+
         for instance_set in instance_sets:
             for measure_instance in instance_set.measure_instances:
-                if measure_instance.spec not in {x.spec for x in measure_instances}:
+                if measure_instance.spec not in measure_specs:
+                    measure_specs.add(measure_instance.spec)
                     measure_instances.append(measure_instance)
             for dimension_instance in instance_set.dimension_instances:
-                if dimension_instance.spec not in {x.spec for x in dimension_instances}:
+                if dimension_instance.spec not in dimension_specs:
+                    dimension_specs.add(dimension_instance.spec)
                     dimension_instances.append(dimension_instance)
             for time_dimension_instance in instance_set.time_dimension_instances:
-                if time_dimension_instance.spec not in {x.spec for x in time_dimension_instances}:
+                if time_dimension_instance.spec not in time_dimension_specs:
+                    time_dimension_specs.add(time_dimension_instance.spec)
                     time_dimension_instances.append(time_dimension_instance)
             for entity_instance in instance_set.entity_instances:
-                if entity_instance.spec not in {x.spec for x in entity_instances}:
+                if entity_instance.spec not in entity_specs:
+                    entity_specs.add(entity_instance.spec)
                     entity_instances.append(entity_instance)
             for group_by_metric_instance in instance_set.group_by_metric_instances:
-                if group_by_metric_instance.spec not in {x.spec for x in group_by_metric_instances}:
+                if group_by_metric_instance.spec not in group_by_metric_specs:
+                    group_by_metric_specs.add(group_by_metric_instance.spec)
                     group_by_metric_instances.append(group_by_metric_instance)
             for metric_instance in instance_set.metric_instances:
-                if metric_instance.spec not in {x.spec for x in metric_instances}:
+                if metric_instance.spec not in metric_specs:
+                    metric_specs.add(metric_instance.spec)
                     metric_instances.append(metric_instance)
             for metadata_instance in instance_set.metadata_instances:
-                if metadata_instance.spec not in {x.spec for x in metadata_instances}:
+                if metadata_instance.spec not in metadata_specs:
+                    metadata_specs.add(metadata_instance.spec)
                     metadata_instances.append(metadata_instance)
 
         return InstanceSet(
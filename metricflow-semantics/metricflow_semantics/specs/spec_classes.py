@@ -533,6 +533,10 @@ class NonAdditiveDimensionSpec(SerializableDataclass):
             return False
         return self.bucket_hash == other.bucket_hash
 
+    def __hash__(self) -> int:  # noqa: D105
+        # Needs to be consistent with __eq__, which doesn't depend on the order of the window groupings.
+        return hash((self.window_choice.name, self.name, tuple(sorted(self.window_groupings))))
+
 
 @dataclass(frozen=True)
 class MeasureSpec(InstanceSpec):  # noqa: D101
@@ -7,7 +7,7 @@ import pathlib
 import re
 import webbrowser
 from dataclasses import dataclass
-from typing import Any, Callable, Optional, Tuple, TypeVar
+from typing import Any, Callable, Optional, Pattern, Tuple, TypeVar
 
 import _pytest.fixtures
 import tabulate
@@ -22,6 +22,9 @@ from metricflow_semantics.specs.spec_set import InstanceSpecSet
 
 logger = logging.getLogger(__name__)
 
+# Matches the brackets around the parameters in a parameterized test name like 'test_case[some_param]'.
+_TEST_NAME_PARAMETER_BRACKET_PATTERN = re.compile(r"[\[\]]")
+
 
 @dataclass(frozen=True)
 class SnapshotConfiguration:
@@ -97,11 +100,12 @@ def assert_snapshot_text_equal(
 
         if exclude_line_regex:
             # Filter out lines that should be ignored.
-            expected_snapshot_text = _exclude_lines_matching_regex(
-                file_contents=expected_snapshot_text, exclude_line_regex=exclude_line_regex
+            exclude_line_pattern = re.compile(exclude_line_regex)
+            expected_snapshot_text = _exclude_lines_matching_pattern(
+                file_contents=expected_snapshot_text, exclude_line_pattern=exclude_line_pattern
             )
-            snapshot_text = _exclude_lines_matching_regex(
-                file_contents=snapshot_text, exclude_line_regex=exclude_line_regex
+            snapshot_text = _exclude_lines_matching_pattern(
+                file_contents=snapshot_text, exclude_line_pattern=exclude_line_pattern
             )
         # pytest should show a detailed diff with "assert actual_modified == expected_modified", but it's not, so doing
         # this instead.
@@ -140,7 +144,7 @@ def snapshot_path_prefix(
     snapshot_file_name_parts = []
     # Parameterized test names look like 'test_case[some_param]'. "[" and "]" are annoying to deal with in the shell,
     # so replace them with dunders.
-    snapshot_file_name_parts.extend(re.split(r"[\[\]]", test_name))
+    snapshot_file_name_parts.extend(_TEST_NAME_PARAMETER_BRACKET_PATTERN.split(test_name))
     # A trailing ] will produce an empty string in the list, so remove that.
     snapshot_file_name_parts = [part for part in snapshot_file_name_parts if len(part) > 0]
     snapshot_file_name_parts.append(snapshot_id)
@@ -158,10 +162,9 @@ def snapshot_path_prefix(
     return directory_to_store_snapshot.joinpath(snapshot_file_name_prefix)
 
 
-def _exclude_lines_matching_regex(file_contents: str, exclude_line_regex: str) -> str:
-    """Removes lines from file contents if the line matches exclude_regex."""
-    compiled_regex = re.compile(exclude_line_regex)
-    return "\n".join([line for line in file_contents.split("\n") if not compiled_regex.match(line)])
+def _exclude_lines_matching_pattern(file_contents: str, exclude_line_pattern: Pattern[str]) -> str:
+    """Removes lines from file contents if the line matches exclude_line_pattern."""
+    return "\n".join([line for line in file_contents.split("\n") if not exclude_line_pattern.match(line)])
 
 
 DISPLAY_SNAPSHOTS_CLI_FLAG = "--display-snapshots"
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import List, Optional, Sequence
+from functools import cached_property
+from typing import Dict, List, Optional, Sequence
 
 from dbt_semantic_interfaces.references import SemanticModelReference
 from metricflow_semantics.assert_one_arg import assert_exactly_one_arg_set
-from metricflow_semantics.instances import EntityInstance, InstanceSet
+from metricflow_semantics.instances import EntityInstance, InstanceSet, TimeDimensionInstance
 from metricflow_semantics.specs.column_assoc import ColumnAssociation
 from metricflow_semantics.specs.spec_classes import DimensionSpec, EntitySpec, TimeDimensionSpec
 from typing_extensions import override
@@ -43,11 +44,12 @@ class SqlDataSet(DataSet):
             raise RuntimeError("This node was not created with a SQL node.")
         return node_to_return
 
-    @property
+    @cached_property
     def checked_sql_select_node(self) -> SqlSelectStatementNode:
         """If applicable, return a SELECT node that can be used to read data from the given SQL table or SQL query.
 
-        Otherwise, an exception is thrown.
+        Otherwise, an exception is thrown. This is accessed by most nodes that read from this data set, so the result is
+        cached.
         """
         if self._sql_select_node is None:
             raise RuntimeError(f"{self} was created with a SQL node that is not a {SqlSelectStatementNode}")
@@ -115,25 +117,34 @@ class SqlDataSet(DataSet):
         time_dimension_spec: TimeDimensionSpec,
     ) -> ColumnAssociation:
         """Given the name of the time dimension, return the set of columns associated with it in the data set."""
-        matching_instances = 0
-        column_associations_to_return = None
-        for time_dimension_instance in self.instance_set.time_dimension_instances:
-            if time_dimension_instance.spec == time_dimension_spec:
-                column_associations_to_return = time_dimension_instance.associated_columns
-                matching_instances += 1
+        matching_instances = self.time_dimension_instances_for_spec(time_dimension_spec)
 
-        if matching_instances > 1:
+        if len(matching_instances) > 1:
             raise RuntimeError(
                 f"More than one time dimension instance with spec {time_dimension_spec} in "
                 f"instance set: {self.instance_set}"
             )
 
-        if not column_associations_to_return:
+        if not matching_instances or not matching_instances[0].associated_columns:
             raise RuntimeError(
                 f"No time dimension instances with spec {time_dimension_spec} in instance set: {self.instance_set}"
             )
 
-        return column_associations_to_return[0]
+        return matching_instances[0].associated_columns[0]
+
+    def time_dimension_instances_for_spec(
+        self, time_dimension_spec: TimeDimensionSpec
+    ) -> Sequence[TimeDimensionInstance]:
+        """Return the time dimension instances in the data set with the given spec, in instance set order."""
+        return self._time_dimension_spec_to_instances.get(time_dimension_spec, ())
+
+    @cached_property
+    def _time_dimension_spec_to_instances(self) -> Dict[TimeDimensionSpec, List[TimeDimensionInstance]]:
+        """Index of the time dimension instances by spec, built on first use as lookups are repeated in joins."""
+        spec_to_instances: Dict[TimeDimensionSpec, List[TimeDimensionInstance]] = {}
+        for time_dimension_instance in self.instance_set.time_dimension_instances:
+            spec_to_instances.setdefault(time_dimension_instance.spec, []).append(time_dimension_instance)
+        return spec_to_instances
 
     @property
     @override
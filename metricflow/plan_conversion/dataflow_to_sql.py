@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import functools
 import logging
-from collections import OrderedDict
-from typing import List, Optional, Sequence, Tuple, Union
+import sys
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 from dbt_semantic_interfaces.enum_extension import assert_values_exhausted
 from dbt_semantic_interfaces.naming.keywords import METRIC_TIME_ELEMENT_NAME
-from dbt_semantic_interfaces.protocols.metric import MetricInputMeasure, MetricType
-from dbt_semantic_interfaces.references import EntityReference, MetricModelReference
+from dbt_semantic_interfaces.protocols.metric import Metric, MetricInputMeasure, MetricType
+from dbt_semantic_interfaces.references import (
+    EntityReference,
+    MeasureReference,
+    MetricModelReference,
+    MetricReference,
+)
 from dbt_semantic_interfaces.type_enums.aggregation_type import AggregationType
 from dbt_semantic_interfaces.type_enums.conversion_calculation_type import ConversionCalculationType
 from dbt_semantic_interfaces.validations.unique_valid_name import MetricFlowReservedKeywords
@@ -31,6 +38,7 @@ from metricflow_semantics.specs.column_assoc import (
 )
 from metricflow_semantics.specs.spec_classes import (
     GroupByMetricSpec,
+    InstanceSpec,
     MeasureSpec,
     MetadataSpec,
     MetricSpec,
@@ -72,6 +80,7 @@ from metricflow.plan_conversion.instance_converters import (
     AddMetrics,
     AliasAggregatedMeasures,
     ChangeAssociatedColumns,
+    ChangeAssociatedColumnsAndCreateSelectColumns,
     ChangeMeasureAggregationState,
     ConvertToMetadata,
     CreateSelectColumnForCombineOutputNode,
@@ -140,6 +149,32 @@ from metricflow.sql.sql_plan import (
 
 logger = logging.getLogger(__name__)
 
+# Aggregation state changes for measures after joining other data sets to them. Since aggregated measures could be
+# duplicated by the join, they need to be re-aggregated.
+_AGGREGATION_STATE_CHANGES_AFTER_JOIN: Dict[AggregationState, AggregationState] = {
+    AggregationState.NON_AGGREGATED: AggregationState.NON_AGGREGATED,
+    AggregationState.COMPLETE: AggregationState.PARTIAL,
+    AggregationState.PARTIAL: AggregationState.PARTIAL,
+}
+
+# Aggregation state changes for measures after they have been aggregated.
+_AGGREGATION_STATE_CHANGES_AFTER_AGGREGATION: Dict[AggregationState, AggregationState] = {
+    AggregationState.NON_AGGREGATED: AggregationState.COMPLETE,
+    AggregationState.COMPLETE: AggregationState.COMPLETE,
+    AggregationState.PARTIAL: AggregationState.COMPLETE,
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_iso8601(dt: datetime) -> str:
+    """Format the datetime for use in time range comparisons, caching since the same constraint is used repeatedly."""
+    return dt.strftime(ISO8601_PYTHON_FORMAT)
+
+
+def _time_granularity_sort_key(time_dimension_instance: TimeDimensionInstance) -> int:
+    """Key to order time dimension instances from the smallest to the largest granularity."""
+    return time_dimension_instance.spec.time_granularity.to_int()
+
 
 def _make_time_range_comparison_expr(
     table_alias: str, column_alias: str, time_range_constraint: TimeRangeConstraint
@@ -154,14 +189,37 @@ def _make_time_range_comparison_expr(
             )
         ),
         start_expr=SqlStringLiteralExpression(
-            literal_value=time_range_constraint.start_time.strftime(ISO8601_PYTHON_FORMAT),
+            literal_value=_format_iso8601(time_range_constraint.start_time),
         ),
         end_expr=SqlStringLiteralExpression(
-            literal_value=time_range_constraint.end_time.strftime(ISO8601_PYTHON_FORMAT),
+            literal_value=_format_iso8601(time_range_constraint.end_time),
         ),
     )
 
 
+class _CachingColumnAssociationResolver(ColumnAssociationResolver):
+    """Wraps a resolver to reuse the column associations for specs that were already resolved.
+
+    The same specs are resolved many times while converting a single plan (e.g. once per node that passes an instance
+    through), so this avoids repeating that work.
+    """
+
+    def __init__(self, column_association_resolver: ColumnAssociationResolver) -> None:  # noqa: D107
+        self._column_association_resolver = column_association_resolver
+        self._spec_to_column_association: Dict[InstanceSpec, ColumnAssociation] = {}
+
+    def resolve_spec(self, spec: InstanceSpec) -> ColumnAssociation:  # noqa: D102
+        column_association = self._spec_to_column_association.get(spec)
+        if column_association is None:
+            column_association = self._column_association_resolver.resolve_spec(spec)
+            self._spec_to_column_association[spec] = column_association
+        return column_association
+
+    def clear_cache(self) -> None:
+        """Remove all previously resolved column associations."""
+        self._spec_to_column_association.clear()
+
+
 class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
     """Generates an SQL query plan from a node in the a metric dataflow plan."""
 
@@ -177,9 +235,10 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
             queries.
             semantic_manifest_lookup: Self-explanatory.
         """
-        self._column_association_resolver = column_association_resolver
+        self._column_association_resolver = _CachingColumnAssociationResolver(column_association_resolver)
         self._semantic_manifest_lookup = semantic_manifest_lookup
         self._metric_lookup = semantic_manifest_lookup.metric_lookup
+        self._metric_reference_to_expr_builder: Dict[MetricReference, Callable[[str], SqlExpressionNode]] = {}
         self._semantic_model_lookup = semantic_manifest_lookup.semantic_model_lookup
         self._time_spine_source = TimeSpineSource.create_from_manifest(semantic_manifest_lookup.semantic_manifest)
 
@@ -195,21 +254,26 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         sql_query_plan_id: Optional[DagId] = None,
     ) -> ConvertToSqlPlanResult:
         """Create an SQL query plan that represents the computation up to the given dataflow plan node."""
+        self._column_association_resolver.clear_cache()
         data_set = dataflow_plan_node.accept(self)
         sql_node: SqlQueryPlanNode = data_set.sql_node
         # TODO: Make this a more generally accessible attribute instead of checking against the
         # BigQuery-ness of the engine
         use_column_alias_in_group_by = sql_engine_type is SqlEngine.BIGQUERY
 
+        # structure_text() walks the entire SQL plan, so only generate it when it will be logged.
+        log_optimizer_steps = logger.isEnabledFor(logging.INFO)
         for optimizer in SqlQueryOptimizerConfiguration.optimizers_for_level(
             optimization_level, use_column_alias_in_group_by=use_column_alias_in_group_by
         ):
-            logger.info(f"Applying optimizer: {optimizer.__class__.__name__}")
+            optimizer_name = optimizer.__class__.__name__
+            if log_optimizer_steps:
+                logger.info(f"Applying optimizer: {optimizer_name}")
             sql_node = optimizer.optimize(sql_node)
-            logger.info(
-                f"After applying {optimizer.__class__.__name__}, the SQL query plan is:\n"
-                f"{indent(sql_node.structure_text())}"
-            )
+            if log_optimizer_steps:
+                logger.info(
+                    f"After applying {optimizer_name}, the SQL query plan is:\n{indent(sql_node.structure_text())}"
+                )
 
         return ConvertToSqlPlanResult(
             instance_set=data_set.instance_set,
@@ -217,8 +281,12 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         )
 
     def _next_unique_table_alias(self) -> str:
-        """Return the next unique table alias to use in generating queries."""
-        return SequentialIdGenerator.create_next_id(StaticIdPrefix.SUB_QUERY).str_value
+        """Return the next unique table alias to use in generating queries.
+
+        The alias is referenced by many column references in the SQL plan, so it's interned to share the string and
+        make comparisons cheaper.
+        """
+        return sys.intern(SequentialIdGenerator.create_next_id(StaticIdPrefix.SUB_QUERY).str_value)
 
     def _make_time_spine_data_set(
         self,
@@ -238,16 +306,16 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
             table_alias=time_spine_table_alias, column_name=time_spine_source.time_column_name
         )
 
-        select_columns: Tuple[SqlSelectColumn, ...] = ()
-        apply_group_by = False
-        column_alias = self.column_association_resolver.resolve_spec(agg_time_dimension_instance.spec).column_name
+        column_alias = self._column_association_resolver.resolve_spec(agg_time_dimension_instance.spec).column_name
         # If the requested granularity matches that of the time spine, do a direct select.
         # TODO: also handle date part.
-        if agg_time_dimension_instance.spec.time_granularity == time_spine_source.time_column_granularity:
-            select_columns += (SqlSelectColumn(expr=column_expr, column_alias=column_alias),)
+        apply_group_by = agg_time_dimension_instance.spec.time_granularity != time_spine_source.time_column_granularity
+        select_columns: Tuple[SqlSelectColumn, ...]
+        if not apply_group_by:
+            select_columns = (SqlSelectColumn(expr=column_expr, column_alias=column_alias),)
         # Otherwise, apply a DATE_TRUNC() and aggregate via group_by.
         else:
-            select_columns += (
+            select_columns = (
                 SqlSelectColumn(
                     expr=SqlDateTruncExpression(
                         time_granularity=agg_time_dimension_instance.spec.time_granularity, arg=column_expr
@@ -255,7 +323,6 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
                     column_alias=column_alias,
                 ),
             )
-            apply_group_by = True
 
         return SqlDataSet(
             instance_set=time_spine_instance_set,
@@ -286,18 +353,17 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
 
     def visit_join_over_time_range_node(self, node: JoinOverTimeRangeNode) -> SqlDataSet:
         """Generate time range join SQL."""
-        table_alias_to_instance_set: OrderedDict[str, InstanceSet] = OrderedDict()
+        table_alias_to_instance_set: Dict[str, InstanceSet] = {}
         input_data_set = node.parent_node.accept(self)
         input_data_set_alias = self._next_unique_table_alias()
 
-        agg_time_dimension_instance: Optional[TimeDimensionInstance] = None
-        for instance in input_data_set.instance_set.time_dimension_instances:
-            if instance.spec == node.time_dimension_spec_for_join:
-                agg_time_dimension_instance = instance
-                break
+        agg_time_dimension_instances = input_data_set.time_dimension_instances_for_spec(
+            node.time_dimension_spec_for_join
+        )
         assert (
-            agg_time_dimension_instance
+            agg_time_dimension_instances
         ), "Specified metric time spec not found in parent data set. This should have been caught by validations."
+        agg_time_dimension_instance = agg_time_dimension_instances[0]
 
         time_spine_data_set_alias = self._next_unique_table_alias()
 
@@ -314,9 +380,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
             metric_data_set=AnnotatedSqlDataSet(
                 data_set=input_data_set,
                 alias=input_data_set_alias,
-                _metric_time_column_name=input_data_set.column_association_for_time_dimension(
-                    agg_time_dimension_instance.spec
-                ).column_name,
+                _metric_time_column_name=agg_time_dimension_instance.associated_column.column_name,
             ),
             time_spine_data_set=AnnotatedSqlDataSet(
                 data_set=time_spine_data_set,
@@ -355,7 +419,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         # Keep a mapping between the table aliases that would be used in the query and the MDO instances in that source.
         # e.g. when building "FROM from_table a JOIN right_table b", the value for key "a" would be the instances in
         # "from_table"
-        table_alias_to_instance_set: OrderedDict[str, InstanceSet] = OrderedDict()
+        table_alias_to_instance_set: Dict[str, InstanceSet] = {}
 
         # Convert the dataflow from the left node to a DataSet and add context for it to table_alias_to_instance_set
         # A DataSet is a bundle of the SQL query (in object form) and the MDO instances that the SQL query contains.
@@ -366,6 +430,8 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         # Build the join descriptions for the SqlQueryPlan - different from node.join_descriptions which are the join
         # descriptions from the dataflow plan.
         sql_join_descs: List[SqlJoinDescription] = []
+        # The left side is the same for all join targets.
+        annotated_from_data_set = AnnotatedSqlDataSet(data_set=from_data_set, alias=from_data_set_alias)
 
         # The dataflow plan describes how the data sets coming from the parent nodes should be joined together. Use
         # those descriptions to convert them to join descriptions for the SQL query plan.
@@ -377,7 +443,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
             right_data_set_alias = self._next_unique_table_alias()
 
             sql_join_desc = SqlQueryPlanJoinBuilder.make_base_output_join_description(
-                left_data_set=AnnotatedSqlDataSet(data_set=from_data_set, alias=from_data_set_alias),
+                left_data_set=annotated_from_data_set,
                 right_data_set=AnnotatedSqlDataSet(data_set=right_data_set, alias=right_data_set_alias),
                 join_description=join_description,
             )
@@ -414,13 +480,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         # since we removed the entities and added the dimensions. The dimensions could have the same value for
         # multiple rows, so we'll need to re-aggregate.
         from_data_set_output_instance_set = from_data_set_output_instance_set.transform(
-            ChangeMeasureAggregationState(
-                {
-                    AggregationState.NON_AGGREGATED: AggregationState.NON_AGGREGATED,
-                    AggregationState.COMPLETE: AggregationState.PARTIAL,
-                    AggregationState.PARTIAL: AggregationState.PARTIAL,
-                }
-            )
+            ChangeMeasureAggregationState(_AGGREGATION_STATE_CHANGES_AFTER_JOIN)
         )
 
         table_alias_to_instance_set[from_data_set_alias] = from_data_set_output_instance_set
@@ -428,7 +488,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         # Construct the data set that contains the updated instances and the SQL nodes that should go in the various
         # clauses.
         return SqlDataSet(
-            instance_set=InstanceSet.merge(list(table_alias_to_instance_set.values())),
+            instance_set=InstanceSet.merge(tuple(table_alias_to_instance_set.values())),
             sql_select_node=SqlSelectStatementNode(
                 description=node.description,
                 select_columns=create_select_columns_for_instance_sets(
@@ -455,21 +515,20 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         the measure names as references.
 
         """
+        column_association_resolver = self._column_association_resolver
+        semantic_model_lookup = self._semantic_model_lookup
         # Get the data from the parent, and change measure instances to the aggregated state.
         from_data_set: SqlDataSet = node.parent_node.accept(self)
         aggregated_instance_set = from_data_set.instance_set.transform(
-            ChangeMeasureAggregationState(
-                {
-                    AggregationState.NON_AGGREGATED: AggregationState.COMPLETE,
-                    AggregationState.COMPLETE: AggregationState.COMPLETE,
-                    AggregationState.PARTIAL: AggregationState.COMPLETE,
-                }
-            )
-        )
-        # Also, the columns should always follow the resolver format.
-        aggregated_instance_set = aggregated_instance_set.transform(
-            ChangeAssociatedColumns(self._column_association_resolver)
+            ChangeMeasureAggregationState(_AGGREGATION_STATE_CHANGES_AFTER_AGGREGATION)
         )
+        has_aliases = any(spec.alias for spec in node.metric_input_measure_specs)
+        # Also, the columns should always follow the resolver format. If there are aliases, this is done after the
+        # aliases are applied below instead.
+        if not has_aliases:
+            aggregated_instance_set = aggregated_instance_set.transform(
+                ChangeAssociatedColumns(column_association_resolver)
+            )
 
         # Add fill null property to corresponding measure spec
         aggregated_instance_set = aggregated_instance_set.transform(
@@ -484,13 +543,13 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         select_column_set: SelectColumnSet = aggregated_instance_set.transform(
             CreateSelectColumnsWithMeasuresAggregated(
                 table_alias=from_data_set_alias,
-                column_resolver=self._column_association_resolver,
-                semantic_model_lookup=self._semantic_model_lookup,
+                column_resolver=column_association_resolver,
+                semantic_model_lookup=semantic_model_lookup,
                 metric_input_measure_specs=node.metric_input_measure_specs,
             )
         )
 
-        if any((spec.alias for spec in node.metric_input_measure_specs)):
+        if has_aliases:
             # This is a little silly, but we need to update the column instance set with the new aliases
             # There are a number of refactoring options - simplest is to consolidate this with
             # ChangeMeasureAggregationState, assuming there are no ordering dependencies up above
@@ -499,7 +558,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
             )
             # and make sure we follow the resolver format for any newly aliased measures....
             aggregated_instance_set = aggregated_instance_set.transform(
-                ChangeAssociatedColumns(self._column_association_resolver)
+                ChangeAssociatedColumns(column_association_resolver)
             )
 
         return SqlDataSet(
@@ -517,16 +576,19 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
 
     def visit_compute_metrics_node(self, node: ComputeMetricsNode) -> SqlDataSet:
         """Generates the query that realizes the behavior of ComputeMetricsNode."""
+        column_association_resolver = self._column_association_resolver
         from_data_set: SqlDataSet = node.parent_node.accept(self)
         from_data_set_alias = self._next_unique_table_alias()
 
         # TODO: Check that all measures for the metrics are in the input instance set
-        # The desired output instance set has no measures, so create a copy with those removed.
+        # The desired output instance set has no measures, so create a copy with those removed. Metrics are removed as
+        # well since they are re-added below. Remove these first so that the columns aren't changed for instances that
+        # will be discarded anyway.
         output_instance_set: InstanceSet = from_data_set.instance_set.transform(RemoveMeasures())
+        output_instance_set = output_instance_set.transform(RemoveMetrics())
 
         # Also, the output columns should always follow the resolver format.
-        output_instance_set = output_instance_set.transform(ChangeAssociatedColumns(self._column_association_resolver))
-        output_instance_set = output_instance_set.transform(RemoveMetrics())
+        output_instance_set = output_instance_set.transform(ChangeAssociatedColumns(column_association_resolver))
 
         if node.for_group_by_source_node:
             assert (
@@ -536,7 +598,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         non_metric_select_column_set: SelectColumnSet = output_instance_set.transform(
             CreateSelectColumnsForInstances(
                 table_alias=from_data_set_alias,
-                column_resolver=self._column_association_resolver,
+                column_resolver=column_association_resolver,
             )
         )
 
@@ -545,105 +607,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         metric_instances = []
         group_by_metric_instance: Optional[GroupByMetricInstance] = None
         for metric_spec in node.metric_specs:
-            metric = self._metric_lookup.get_metric(metric_spec.reference)
-
-            metric_expr: Optional[SqlExpressionNode] = None
-            input_measure: Optional[MetricInputMeasure] = None
-            if metric.type is MetricType.RATIO:
-                numerator = metric.type_params.numerator
-                denominator = metric.type_params.denominator
-                assert (
-                    numerator is not None and denominator is not None
-                ), "Missing numerator or denominator for ratio metric, this should have been caught in validation!"
-                numerator_column_name = self._column_association_resolver.resolve_spec(
-                    MetricSpec.from_reference(numerator.post_aggregation_reference)
-                ).column_name
-                denominator_column_name = self._column_association_resolver.resolve_spec(
-                    MetricSpec.from_reference(denominator.post_aggregation_reference)
-                ).column_name
-
-                metric_expr = SqlRatioComputationExpression(
-                    numerator=SqlColumnReferenceExpression(
-                        SqlColumnReference(
-                            table_alias=from_data_set_alias,
-                            column_name=numerator_column_name,
-                        )
-                    ),
-                    denominator=SqlColumnReferenceExpression(
-                        SqlColumnReference(
-                            table_alias=from_data_set_alias,
-                            column_name=denominator_column_name,
-                        )
-                    ),
-                )
-            elif metric.type is MetricType.SIMPLE:
-                if len(metric.input_measures) > 0:
-                    assert (
-                        len(metric.input_measures) == 1
-                    ), "Simple metrics should always source from exactly 1 measure."
-                    input_measure = metric.input_measures[0]
-                    expr = self._column_association_resolver.resolve_spec(
-                        MeasureSpec(element_name=input_measure.post_aggregation_measure_reference.element_name)
-                    ).column_name
-                else:
-                    expr = metric.name
-                metric_expr = self.__make_col_reference_or_coalesce_expr(
-                    column_name=expr, input_measure=input_measure, from_data_set_alias=from_data_set_alias
-                )
-            elif metric.type is MetricType.CUMULATIVE:
-                assert (
-                    len(metric.measure_references) == 1
-                ), "Cumulative metrics should always source from exactly 1 measure."
-                input_measure = metric.input_measures[0]
-                expr = self._column_association_resolver.resolve_spec(
-                    MeasureSpec(element_name=input_measure.post_aggregation_measure_reference.element_name)
-                ).column_name
-                metric_expr = self.__make_col_reference_or_coalesce_expr(
-                    column_name=expr, input_measure=input_measure, from_data_set_alias=from_data_set_alias
-                )
-            elif metric.type is MetricType.DERIVED:
-                assert (
-                    metric.type_params.expr
-                ), "Derived metrics are required to have an `expr` in their YAML definition."
-                metric_expr = SqlStringExpression(sql_expr=metric.type_params.expr)
-            elif metric.type == MetricType.CONVERSION:
-                conversion_type_params = metric.type_params.conversion_type_params
-                assert (
-                    conversion_type_params
-                ), "A conversion metric should have type_params.conversion_type_params defined."
-                base_measure = conversion_type_params.base_measure
-                conversion_measure = conversion_type_params.conversion_measure
-                base_measure_column = self._column_association_resolver.resolve_spec(
-                    MeasureSpec(element_name=base_measure.post_aggregation_measure_reference.element_name)
-                ).column_name
-                conversion_measure_column = self._column_association_resolver.resolve_spec(
-                    MeasureSpec(element_name=conversion_measure.post_aggregation_measure_reference.element_name)
-                ).column_name
-
-                calculation_type = conversion_type_params.calculation
-                conversion_column_reference = SqlColumnReferenceExpression(
-                    SqlColumnReference(
-                        table_alias=from_data_set_alias,
-                        column_name=conversion_measure_column,
-                    )
-                )
-                base_column_reference = SqlColumnReferenceExpression(
-                    SqlColumnReference(
-                        table_alias=from_data_set_alias,
-                        column_name=base_measure_column,
-                    )
-                )
-                if calculation_type == ConversionCalculationType.CONVERSION_RATE:
-                    metric_expr = SqlRatioComputationExpression(
-                        numerator=conversion_column_reference,
-                        denominator=base_column_reference,
-                    )
-                elif calculation_type == ConversionCalculationType.CONVERSIONS:
-                    metric_expr = conversion_column_reference
-            else:
-                assert_values_exhausted(metric.type)
-
-            assert metric_expr
+            metric_expr = self._get_metric_expr_builder(metric_spec.reference)(from_data_set_alias)
 
             defined_from = MetricModelReference(metric_name=metric_spec.element_name)
 
@@ -654,14 +618,14 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
                     entity_links=(),
                     metric_subquery_entity_links=entity_spec.entity_links + (entity_spec.reference,),
                 )
-                output_column_association = self._column_association_resolver.resolve_spec(group_by_metric_spec)
+                output_column_association = column_association_resolver.resolve_spec(group_by_metric_spec)
                 group_by_metric_instance = GroupByMetricInstance(
                     associated_columns=(output_column_association,),
                     defined_from=defined_from,
                     spec=group_by_metric_spec,
                 )
             else:
-                output_column_association = self._column_association_resolver.resolve_spec(metric_spec)
+                output_column_association = column_association_resolver.resolve_spec(metric_spec)
                 metric_instances.append(
                     MetricInstance(
                         associated_columns=(output_column_association,),
@@ -693,29 +657,163 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
             ),
         )
 
+    def _get_metric_expr_builder(self, metric_reference: MetricReference) -> Callable[[str], SqlExpressionNode]:
+        """Return a function that builds the expression to compute the metric from a table with the given alias.
+
+        The metric definition and the names of the input columns don't change between calls, so the builder is created
+        once per metric and reused.
+        """
+        metric_expr_builder = self._metric_reference_to_expr_builder.get(metric_reference)
+        if metric_expr_builder is None:
+            metric_expr_builder = self._make_metric_expr_builder(metric_reference)
+            self._metric_reference_to_expr_builder[metric_reference] = metric_expr_builder
+        return metric_expr_builder
+
+    def _make_metric_expr_builder(self, metric_reference: MetricReference) -> Callable[[str], SqlExpressionNode]:
+        metric = self._metric_lookup.get_metric(metric_reference)
+        metric_type = metric.type
+        if metric_type is MetricType.RATIO:
+            return self._make_ratio_metric_expr_builder(metric)
+        elif metric_type is MetricType.SIMPLE or metric_type is MetricType.CUMULATIVE:
+            return self._make_measure_metric_expr_builder(metric)
+        elif metric_type is MetricType.DERIVED:
+            return self._make_derived_metric_expr_builder(metric)
+        elif metric_type is MetricType.CONVERSION:
+            return self._make_conversion_metric_expr_builder(metric)
+        else:
+            assert_values_exhausted(metric_type)
+
+    def _make_ratio_metric_expr_builder(self, metric: Metric) -> Callable[[str], SqlExpressionNode]:
+        column_association_resolver = self._column_association_resolver
+        numerator = metric.type_params.numerator
+        denominator = metric.type_params.denominator
+        assert (
+            numerator is not None and denominator is not None
+        ), "Missing numerator or denominator for ratio metric, this should have been caught in validation!"
+        numerator_column_name = column_association_resolver.resolve_spec(
+            MetricSpec.from_reference(numerator.post_aggregation_reference)
+        ).column_name
+        denominator_column_name = column_association_resolver.resolve_spec(
+            MetricSpec.from_reference(denominator.post_aggregation_reference)
+        ).column_name
+
+        def _build_ratio_expr(from_data_set_alias: str) -> SqlExpressionNode:
+            return SqlRatioComputationExpression(
+                numerator=SqlColumnReferenceExpression(
+                    SqlColumnReference(
+                        table_alias=from_data_set_alias,
+                        column_name=numerator_column_name,
+                    )
+                ),
+                denominator=SqlColumnReferenceExpression(
+                    SqlColumnReference(
+                        table_alias=from_data_set_alias,
+                        column_name=denominator_column_name,
+                    )
+                ),
+            )
+
+        return _build_ratio_expr
+
+    def _make_measure_metric_expr_builder(self, metric: Metric) -> Callable[[str], SqlExpressionNode]:
+        """Handles simple and cumulative metrics, which are computed directly from the aggregated measure."""
+        input_measure: Optional[MetricInputMeasure] = None
+        if metric.type is MetricType.CUMULATIVE:
+            assert (
+                len(metric.measure_references) == 1
+            ), "Cumulative metrics should always source from exactly 1 measure."
+            input_measure = metric.input_measures[0]
+        elif len(metric.input_measures) > 0:
+            assert len(metric.input_measures) == 1, "Simple metrics should always source from exactly 1 measure."
+            input_measure = metric.input_measures[0]
+
+        if input_measure is not None:
+            column_name = self._measure_column_name(input_measure.post_aggregation_measure_reference)
+        else:
+            column_name = metric.name
+        fill_nulls_with_sql = (
+            str(input_measure.fill_nulls_with)
+            if input_measure is not None and input_measure.fill_nulls_with is not None
+            else None
+        )
+
+        def _build_measure_expr(from_data_set_alias: str) -> SqlExpressionNode:
+            return self.__make_col_reference_or_coalesce_expr(
+                column_name=column_name,
+                fill_nulls_with_sql=fill_nulls_with_sql,
+                from_data_set_alias=from_data_set_alias,
+            )
+
+        return _build_measure_expr
+
+    def _make_derived_metric_expr_builder(self, metric: Metric) -> Callable[[str], SqlExpressionNode]:
+        derived_expr = metric.type_params.expr
+        assert derived_expr, "Derived metrics are required to have an `expr` in their YAML definition."
+
+        def _build_derived_expr(from_data_set_alias: str) -> SqlExpressionNode:
+            return SqlStringExpression(sql_expr=derived_expr)
+
+        return _build_derived_expr
+
+    def _make_conversion_metric_expr_builder(self, metric: Metric) -> Callable[[str], SqlExpressionNode]:
+        conversion_type_params = metric.type_params.conversion_type_params
+        assert conversion_type_params, "A conversion metric should have type_params.conversion_type_params defined."
+        base_measure = conversion_type_params.base_measure
+        conversion_measure = conversion_type_params.conversion_measure
+        base_measure_column = self._measure_column_name(base_measure.post_aggregation_measure_reference)
+        conversion_measure_column = self._measure_column_name(conversion_measure.post_aggregation_measure_reference)
+        calculation_type = conversion_type_params.calculation
+
+        def _build_conversion_expr(from_data_set_alias: str) -> SqlExpressionNode:
+            conversion_column_reference = SqlColumnReferenceExpression(
+                SqlColumnReference(
+                    table_alias=from_data_set_alias,
+                    column_name=conversion_measure_column,
+                )
+            )
+            if calculation_type is ConversionCalculationType.CONVERSIONS:
+                return conversion_column_reference
+            assert (
+                calculation_type is ConversionCalculationType.CONVERSION_RATE
+            ), f"Unhandled conversion calculation type: {calculation_type}"
+            base_column_reference = SqlColumnReferenceExpression(
+                SqlColumnReference(
+                    table_alias=from_data_set_alias,
+                    column_name=base_measure_column,
+                )
+            )
+            return SqlRatioComputationExpression(
+                numerator=conversion_column_reference,
+                denominator=base_column_reference,
+            )
+
+        return _build_conversion_expr
+
+    def _measure_column_name(self, measure_reference: MeasureReference) -> str:
+        """Return the name of the column for the aggregated measure in the output of an aggregation node."""
+        return self._column_association_resolver.resolve_spec(
+            MeasureSpec(element_name=measure_reference.element_name)
+        ).column_name
+
     def __make_col_reference_or_coalesce_expr(
-        self, column_name: str, input_measure: Optional[MetricInputMeasure], from_data_set_alias: str
+        self, column_name: str, fill_nulls_with_sql: Optional[str], from_data_set_alias: str
     ) -> SqlExpressionNode:
         # Use a column reference to improve query optimization.
         metric_expr: SqlExpressionNode = SqlColumnReferenceExpression(
             SqlColumnReference(table_alias=from_data_set_alias, column_name=column_name)
         )
         # Coalesce nulls to requested integer value, if requested.
-        if input_measure and input_measure.fill_nulls_with is not None:
+        if fill_nulls_with_sql is not None:
             metric_expr = SqlAggregateFunctionExpression(
                 sql_function=SqlFunction.COALESCE,
-                sql_function_args=[metric_expr, SqlStringExpression(str(input_measure.fill_nulls_with))],
+                sql_function_args=[metric_expr, SqlStringExpression(fill_nulls_with_sql)],
             )
         return metric_expr
 
     def visit_order_by_limit_node(self, node: OrderByLimitNode) -> SqlDataSet:  # noqa: D102
         from_data_set: SqlDataSet = node.parent_node.accept(self)
-        output_instance_set = from_data_set.instance_set
         from_data_set_alias = self._next_unique_table_alias()
 
-        # Also, the output columns should always follow the resolver format.
-        output_instance_set = output_instance_set.transform(ChangeAssociatedColumns(self._column_association_resolver))
-
         order_by_descriptions = []
         for order_by_spec in node.order_by_specs:
             order_by_descriptions.append(
@@ -732,14 +830,17 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
                 )
             )
 
+        # Also, the output columns should always follow the resolver format. This creates select expressions for all
+        # columns referenced in the instance set.
+        output_instance_set, select_column_set = from_data_set.instance_set.transform(
+            ChangeAssociatedColumnsAndCreateSelectColumns(from_data_set_alias, self._column_association_resolver)
+        )
+
         return SqlDataSet(
             instance_set=output_instance_set,
             sql_select_node=SqlSelectStatementNode(
                 description=node.description,
-                # This creates select expressions for all columns referenced in the instance set.
-                select_columns=output_instance_set.transform(
-                    CreateSelectColumnsForInstances(from_data_set_alias, self._column_association_resolver)
-                ).as_tuple(),
+                select_columns=select_column_set.as_tuple(),
                 from_source=from_data_set.checked_sql_select_node,
                 from_source_alias=from_data_set_alias,
                 order_bys=tuple(order_by_descriptions),
@@ -768,13 +869,12 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         output_instance_set = from_data_set.instance_set.transform(FilterElements(node.include_specs))
         from_data_set_alias = self._next_unique_table_alias()
 
-        # Also, the output columns should always follow the resolver format.
-        output_instance_set = output_instance_set.transform(ChangeAssociatedColumns(self._column_association_resolver))
-
-        # This creates select expressions for all columns referenced in the instance set.
-        select_columns = output_instance_set.transform(
-            CreateSelectColumnsForInstances(from_data_set_alias, self._column_association_resolver)
-        ).as_tuple()
+        # Also, the output columns should always follow the resolver format. This creates select expressions for all
+        # columns referenced in the instance set.
+        output_instance_set, select_column_set = output_instance_set.transform(
+            ChangeAssociatedColumnsAndCreateSelectColumns(from_data_set_alias, self._column_association_resolver)
+        )
+        select_columns = select_column_set.as_tuple()
 
         # If distinct values requested, group by all select columns.
         group_bys = select_columns if node.distinct else ()
@@ -792,12 +892,13 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
     def visit_where_constraint_node(self, node: WhereConstraintNode) -> SqlDataSet:
         """Adds where clause to SQL statement from parent node."""
         parent_data_set: SqlDataSet = node.parent_node.accept(self)
+        from_data_set_alias = self._next_unique_table_alias()
         # Since we're copying the instance set from the parent to conveniently generate the output instance set for this
-        # node, we'll need to change the column names.
-        output_instance_set = parent_data_set.instance_set.transform(
-            ChangeAssociatedColumns(self._column_association_resolver)
+        # node, we'll need to change the column names. This also creates select expressions for all columns referenced
+        # in the instance set.
+        output_instance_set, select_column_set = parent_data_set.instance_set.transform(
+            ChangeAssociatedColumnsAndCreateSelectColumns(from_data_set_alias, self._column_association_resolver)
         )
-        from_data_set_alias = self._next_unique_table_alias()
 
         column_associations_in_where_sql: Sequence[ColumnAssociation] = CreateColumnAssociations(
             column_association_resolver=self._column_association_resolver
@@ -807,10 +908,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
             instance_set=output_instance_set,
             sql_select_node=SqlSelectStatementNode(
                 description=node.description,
-                # This creates select expressions for all columns referenced in the instance set.
-                select_columns=output_instance_set.transform(
-                    CreateSelectColumnsForInstances(from_data_set_alias, self._column_association_resolver)
-                ).as_tuple(),
+                select_columns=select_column_set.as_tuple(),
                 from_source=parent_data_set.checked_sql_select_node,
                 from_source_alias=from_data_set_alias,
                 where=SqlStringExpression(
@@ -859,13 +957,10 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         ), "Shouldn't have a CombineAggregatedOutputsNode in the dataflow plan if there's only 1 parent."
 
         parent_data_sets: List[AnnotatedSqlDataSet] = []
-        table_alias_to_instance_set: OrderedDict[str, InstanceSet] = OrderedDict()
-
         for parent_node in node.parent_nodes:
             parent_sql_data_set = parent_node.accept(self)
             table_alias = self._next_unique_table_alias()
             parent_data_sets.append(AnnotatedSqlDataSet(data_set=parent_sql_data_set, alias=table_alias))
-            table_alias_to_instance_set[table_alias] = parent_sql_data_set.instance_set
 
         # When we create the components of the join that combines metrics it will be one of INNER, FULL OUTER,
         # or CROSS JOIN. Order doesn't matter for these join types, so we will use the first element in the FROM
@@ -874,55 +969,56 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         join_data_sets = parent_data_sets[1:]
 
         # Sanity check that all parents have the same linkable specs before building the join descriptions.
-        linkable_specs = from_data_set.data_set.instance_set.spec_set.linkable_specs
+        from_data_set_spec_set = from_data_set.data_set.instance_set.spec_set
+        linkable_specs = set(from_data_set_spec_set.linkable_specs)
         assert all(
-            [set(x.data_set.instance_set.spec_set.linkable_specs) == set(linkable_specs) for x in join_data_sets]
+            set(x.data_set.instance_set.spec_set.linkable_specs) == linkable_specs for x in join_data_sets
         ), "All parent nodes should have the same set of linkable instances since all values are coalesced."
 
-        linkable_spec_set = from_data_set.data_set.instance_set.spec_set.transform(SelectOnlyLinkableSpecs())
+        linkable_spec_set = from_data_set_spec_set.transform(SelectOnlyLinkableSpecs())
         join_type = SqlJoinType.CROSS_JOIN if len(linkable_spec_set.all_specs) == 0 else SqlJoinType.FULL_OUTER
 
         joins_descriptions: List[SqlJoinDescription] = []
         # TODO: refactor this loop into SqlQueryPlanJoinBuilder
-        column_associations = tuple(
-            self._column_association_resolver.resolve_spec(spec) for spec in linkable_spec_set.all_specs
+        column_names = tuple(
+            self._column_association_resolver.resolve_spec(spec).column_name for spec in linkable_spec_set.all_specs
         )
-        column_names = tuple(association.column_name for association in column_associations)
-        aliases_seen = [from_data_set.alias]
-        for join_data_set in join_data_sets:
+        # Each join coalesces the join keys from all the data sets that precede it.
+        parent_data_set_aliases = tuple(parent_data_set.alias for parent_data_set in parent_data_sets)
+        for i, join_data_set in enumerate(join_data_sets, start=1):
             joins_descriptions.append(
                 SqlQueryPlanJoinBuilder.make_join_description_for_combining_datasets(
                     from_data_set=from_data_set,
                     join_data_set=join_data_set,
                     join_type=join_type,
                     column_names=column_names,
-                    table_aliases_for_coalesce=aliases_seen,
+                    table_aliases_for_coalesce=parent_data_set_aliases[:i],
                 )
             )
-            aliases_seen.append(join_data_set.alias)
 
         # We can merge all parent instances since the common linkable instances will be de-duped.
         output_instance_set = InstanceSet.merge([x.data_set.instance_set for x in parent_data_sets])
         output_instance_set = output_instance_set.transform(ChangeAssociatedColumns(self._column_association_resolver))
 
-        aggregated_select_columns = SelectColumnSet()
-        for table_alias, instance_set in table_alias_to_instance_set.items():
-            aggregated_select_columns = aggregated_select_columns.merge(
-                instance_set.transform(
-                    CreateSelectColumnForCombineOutputNode(
-                        table_alias=table_alias,
-                        column_resolver=self._column_association_resolver,
-                        metric_lookup=self._metric_lookup,
-                    )
+        aggregated_select_column_sets = [
+            parent_data_set.data_set.instance_set.transform(
+                CreateSelectColumnForCombineOutputNode(
+                    table_alias=parent_data_set.alias,
+                    column_resolver=self._column_association_resolver,
+                    metric_lookup=self._metric_lookup,
                 )
             )
+            for parent_data_set in parent_data_sets
+        ]
         linkable_select_column_set = linkable_spec_set.transform(
             CreateSelectCoalescedColumnsForLinkableSpecs(
                 column_association_resolver=self._column_association_resolver,
-                table_aliases=[x.alias for x in parent_data_sets],
+                table_aliases=parent_data_set_aliases,
             )
         )
-        combined_select_column_set = linkable_select_column_set.merge(aggregated_select_columns)
+        combined_select_column_set = SelectColumnSet.merge_all(
+            [linkable_select_column_set] + aggregated_select_column_sets
+        )
 
         return SqlDataSet(
             instance_set=output_instance_set,
@@ -949,16 +1045,16 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         from_data_set: SqlDataSet = node.parent_node.accept(self)
         from_data_set_alias = self._next_unique_table_alias()
 
-        time_dimension_instances_for_metric_time = sorted(
-            from_data_set.metric_time_dimension_instances,
-            key=lambda x: x.spec.time_granularity.to_int(),
-        )
-
+        time_dimension_instances_for_metric_time = from_data_set.metric_time_dimension_instances
         assert (
             len(time_dimension_instances_for_metric_time) > 0
         ), "No metric time dimensions found in the input data set for this node"
 
-        time_dimension_instance_for_metric_time = time_dimension_instances_for_metric_time[0]
+        # Like sorted(), min() returns the first of the instances with the smallest granularity.
+        time_dimension_instance_for_metric_time = min(
+            time_dimension_instances_for_metric_time,
+            key=_time_granularity_sort_key,
+        )
 
         # Build an expression like "ds >= CAST('2020-01-01' AS TIMESTAMP) AND ds <= CAST('2020-01-02' AS TIMESTAMP)"
         constrain_metric_time_column_condition = _make_time_range_comparison_expr(
@@ -1012,44 +1108,42 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
             if aggregation_time_dimension_for_measure == node.aggregation_time_dimension_reference:
                 output_measure_instances.append(measure_instance)
 
-        # Find time dimension instances that refer to the same dimension as the one specified in the node.
-        matching_time_dimension_instances = []
+        # For time dimension instances that refer to the same dimension as the one specified in the node, create the
+        # analog metric time dimension instances for the output.
+        metric_time_dimension_instances: List[TimeDimensionInstance] = []
+        output_column_to_input_column: Dict[str, str] = {}
         for time_dimension_instance in input_data_set.instance_set.time_dimension_instances:
             # The specification for the time dimension to use for aggregation is the local one.
-            if (
+            if not (
                 len(time_dimension_instance.spec.entity_links) == 0
                 and time_dimension_instance.spec.reference == node.aggregation_time_dimension_reference
             ):
-                matching_time_dimension_instances.append(time_dimension_instance)
-
-        output_time_dimension_instances: List[TimeDimensionInstance] = []
-        output_time_dimension_instances.extend(input_data_set.instance_set.time_dimension_instances)
-        output_column_to_input_column: OrderedDict[str, str] = OrderedDict()
-
-        # For those matching time dimension instances, create the analog metric time dimension instances for the output.
-        for matching_time_dimension_instance in matching_time_dimension_instances:
+                continue
             metric_time_dimension_spec = DataSet.metric_time_dimension_spec(
-                time_granularity=matching_time_dimension_instance.spec.time_granularity,
-                date_part=matching_time_dimension_instance.spec.date_part,
+                time_granularity=time_dimension_instance.spec.time_granularity,
+                date_part=time_dimension_instance.spec.date_part,
             )
             metric_time_dimension_column_association = self._column_association_resolver.resolve_spec(
                 metric_time_dimension_spec
             )
-            output_time_dimension_instances.append(
+            metric_time_dimension_instances.append(
                 TimeDimensionInstance(
-                    defined_from=matching_time_dimension_instance.defined_from,
-                    associated_columns=(self._column_association_resolver.resolve_spec(metric_time_dimension_spec),),
+                    defined_from=time_dimension_instance.defined_from,
+                    associated_columns=(metric_time_dimension_column_association,),
                     spec=metric_time_dimension_spec,
                 )
             )
             output_column_to_input_column[
                 metric_time_dimension_column_association.column_name
-            ] = matching_time_dimension_instance.associated_column.column_name
+            ] = time_dimension_instance.associated_column.column_name
+        output_time_dimension_instances = input_data_set.instance_set.time_dimension_instances + tuple(
+            metric_time_dimension_instances
+        )
 
         output_instance_set = InstanceSet(
             measure_instances=tuple(output_measure_instances),
             dimension_instances=input_data_set.instance_set.dimension_instances,
-            time_dimension_instances=tuple(output_time_dimension_instances),
+            time_dimension_instances=output_time_dimension_instances,
             entity_instances=input_data_set.instance_set.entity_instances,
             metric_instances=input_data_set.instance_set.metric_instances,
         )
@@ -1085,18 +1179,16 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
 
         from_data_set_alias = self._next_unique_table_alias()
 
-        # Get the output_instance_set of the parent_node
-        output_instance_set = from_data_set.instance_set
-        output_instance_set = output_instance_set.transform(ChangeAssociatedColumns(self._column_association_resolver))
-
         # Build the JoinDescriptions to handle the row base filtering on the output_data_set
         inner_join_data_set_alias = self._next_unique_table_alias()
 
         column_equality_descriptions: List[ColumnEqualityDescription] = []
 
         # Build Time Dimension SqlSelectColumn
-        time_dimension_column_name = self.column_association_resolver.resolve_spec(node.time_dimension_spec).column_name
-        join_time_dimension_column_name = self.column_association_resolver.resolve_spec(
+        time_dimension_column_name = self._column_association_resolver.resolve_spec(
+            node.time_dimension_spec
+        ).column_name
+        join_time_dimension_column_name = self._column_association_resolver.resolve_spec(
             node.time_dimension_spec.with_aggregation_state(AggregationState.COMPLETE),
         ).column_name
         time_dimension_select_column = SqlSelectColumn(
@@ -1121,7 +1213,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         # Build optional window grouping SqlSelectColumn
         entity_select_columns: List[SqlSelectColumn] = []
         for entity_spec in node.entity_specs:
-            entity_column_name = self.column_association_resolver.resolve_spec(entity_spec).column_name
+            entity_column_name = self._column_association_resolver.resolve_spec(entity_spec).column_name
             entity_select_columns.append(
                 SqlSelectColumn(
                     expr=SqlColumnReferenceExpression(
@@ -1143,7 +1235,7 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         # Propogate additional group by during query time of the non-additive time dimension
         queried_time_dimension_select_column: Optional[SqlSelectColumn] = None
         if node.queried_time_dimension_spec:
-            query_time_dimension_column_name = self.column_association_resolver.resolve_spec(
+            query_time_dimension_column_name = self._column_association_resolver.resolve_spec(
                 node.queried_time_dimension_spec
             ).column_name
             queried_time_dimension_select_column = SqlSelectColumn(
@@ -1176,13 +1268,16 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
             column_equality_descriptions=column_equality_descriptions,
             join_type=SqlJoinType.INNER,
         )
+
+        # The output instances are the instances of the parent node, with the columns following the resolver format.
+        output_instance_set, select_column_set = from_data_set.instance_set.transform(
+            ChangeAssociatedColumnsAndCreateSelectColumns(from_data_set_alias, self._column_association_resolver)
+        )
         return SqlDataSet(
             instance_set=output_instance_set,
             sql_select_node=SqlSelectStatementNode(
                 description=node.description,
-                select_columns=output_instance_set.transform(
-                    CreateSelectColumnsForInstances(from_data_set_alias, self._column_association_resolver)
-                ).as_tuple(),
+                select_columns=select_column_set.as_tuple(),
                 from_source=from_data_set.checked_sql_select_node,
                 from_source_alias=from_data_set_alias,
                 joins_descs=(sql_join_desc,),
@@ -1201,23 +1296,32 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
             agg_time_element_name = METRIC_TIME_ELEMENT_NAME
             agg_time_entity_links = ()
 
-        # Find the time dimension instances in the parent data set that match the one we want to join with.
+        # Select all instances from the parent data set, EXCEPT agg_time_dimensions.
+        # The agg_time_dimensions will be selected from the time spine data set.
+        # In the same pass, find the time dimension instances in the parent data set that match the one we want to
+        # join with.
+        time_dimensions_to_select_from_parent: List[TimeDimensionInstance] = []
+        time_dimensions_to_select_from_time_spine: List[TimeDimensionInstance] = []
         agg_time_dimension_instances: List[TimeDimensionInstance] = []
-        for instance in parent_data_set.instance_set.time_dimension_instances:
+        for time_dimension_instance in parent_data_set.instance_set.time_dimension_instances:
+            time_dimension_spec = time_dimension_instance.spec
             if (
-                instance.spec.date_part is None  # Ensure we don't join using an instance with date part
-                and instance.spec.element_name == agg_time_element_name
-                and instance.spec.entity_links == agg_time_entity_links
+                time_dimension_spec.element_name == agg_time_element_name
+                and time_dimension_spec.entity_links == agg_time_entity_links
             ):
-                agg_time_dimension_instances.append(instance)
+                time_dimensions_to_select_from_time_spine.append(time_dimension_instance)
+                # Ensure we don't join using an instance with date part
+                if time_dimension_spec.date_part is None:
+                    agg_time_dimension_instances.append(time_dimension_instance)
+            else:
+                time_dimensions_to_select_from_parent.append(time_dimension_instance)
 
-        # Choose the instance with the smallest granularity available.
-        agg_time_dimension_instances.sort(key=lambda instance: instance.spec.time_granularity.to_int())
         assert len(agg_time_dimension_instances) > 0, (
             "Couldn't find requested agg_time_dimension in parent data set. The dataflow plan may have been "
             "configured incorrectly."
         )
-        agg_time_dimension_instance_for_join = agg_time_dimension_instances[0]
+        # Choose the instance with the smallest granularity available. Like a stable sort, min() picks the first one.
+        agg_time_dimension_instance_for_join = min(agg_time_dimension_instances, key=_time_granularity_sort_key)
 
         # Build time spine data set using the requested agg_time_dimension name.
         time_spine_alias = self._next_unique_table_alias()
@@ -1232,42 +1336,23 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         join_description = SqlQueryPlanJoinBuilder.make_join_to_time_spine_join_description(
             node=node,
             time_spine_alias=time_spine_alias,
-            agg_time_dimension_column_name=self.column_association_resolver.resolve_spec(
+            agg_time_dimension_column_name=self._column_association_resolver.resolve_spec(
                 agg_time_dimension_instance_for_join.spec
             ).column_name,
             parent_sql_select_node=parent_data_set.checked_sql_select_node,
             parent_alias=parent_alias,
         )
 
-        # Select all instances from the parent data set, EXCEPT agg_time_dimensions.
-        # The agg_time_dimensions will be selected from the time spine data set.
-        time_dimensions_to_select_from_parent: Tuple[TimeDimensionInstance, ...] = ()
-        time_dimensions_to_select_from_time_spine: Tuple[TimeDimensionInstance, ...] = ()
-        for time_dimension_instance in parent_data_set.instance_set.time_dimension_instances:
-            if (
-                time_dimension_instance.spec.element_name == agg_time_element_name
-                and time_dimension_instance.spec.entity_links == agg_time_entity_links
-            ):
-                time_dimensions_to_select_from_time_spine += (time_dimension_instance,)
-            else:
-                time_dimensions_to_select_from_parent += (time_dimension_instance,)
         parent_instance_set = InstanceSet(
             measure_instances=parent_data_set.instance_set.measure_instances,
             dimension_instances=parent_data_set.instance_set.dimension_instances,
-            time_dimension_instances=tuple(
-                time_dimension_instance
-                for time_dimension_instance in parent_data_set.instance_set.time_dimension_instances
-                if not (
-                    time_dimension_instance.spec.element_name == agg_time_element_name
-                    and time_dimension_instance.spec.entity_links == agg_time_entity_links
-                )
-            ),
+            time_dimension_instances=tuple(time_dimensions_to_select_from_parent),
             entity_instances=parent_data_set.instance_set.entity_instances,
             metric_instances=parent_data_set.instance_set.metric_instances,
             metadata_instances=parent_data_set.instance_set.metadata_instances,
         )
         parent_select_columns = create_select_columns_for_instance_sets(
-            self._column_association_resolver, OrderedDict({parent_alias: parent_instance_set})
+            self._column_association_resolver, {parent_alias: parent_instance_set}
         )
 
         # Select agg_time_dimension instance from time spine data set.
@@ -1276,24 +1361,26 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
             and len(time_spine_dataset.checked_sql_select_node.select_columns) == 1
         ), "Time spine dataset not configured properly. Expected exactly one column."
         original_time_spine_dim_instance = time_spine_dataset.instance_set.time_dimension_instances[0]
+        original_time_spine_dim_spec = original_time_spine_dim_instance.spec
+        time_spine_granularity = original_time_spine_dim_spec.time_granularity
         time_spine_column_select_expr: Union[
             SqlColumnReferenceExpression, SqlDateTruncExpression
         ] = SqlColumnReferenceExpression(
-            SqlColumnReference(
-                table_alias=time_spine_alias, column_name=original_time_spine_dim_instance.spec.qualified_name
-            )
+            SqlColumnReference(table_alias=time_spine_alias, column_name=original_time_spine_dim_spec.qualified_name)
         )
 
         time_spine_select_columns = []
-        time_spine_dim_instances = []
-        where_filter: Optional[SqlExpressionNode] = None
+        # Keyed by spec to drop duplicate instances, keeping the first one.
+        spec_to_time_spine_dim_instance: Dict[TimeDimensionSpec, TimeDimensionInstance] = {}
+        where_filter_args: List[SqlExpressionNode] = []
 
         # If offset_to_grain is used, will need to filter down to rows that match selected granularities.
         # Does not apply if one of the granularities selected matches the time spine column granularity.
+        requested_agg_time_dimension_spec_set = frozenset(node.requested_agg_time_dimension_specs)
         need_where_filter = (
-            node.offset_to_grain
-            and original_time_spine_dim_instance.spec not in node.requested_agg_time_dimension_specs
+            node.offset_to_grain and original_time_spine_dim_spec not in requested_agg_time_dimension_spec_set
         )
+        resolve_spec = self._column_association_resolver.resolve_spec
 
         # Add requested granularities (if different from time_spine) and date_parts to time spine column.
         for time_dimension_instance in time_dimensions_to_select_from_time_spine:
@@ -1301,59 +1388,69 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
 
             # TODO: this will break when we start supporting smaller grain than DAY unless the time spine table is
             # updated to use the smallest available grain.
-            if (
-                time_dimension_spec.time_granularity.to_int()
-                < original_time_spine_dim_instance.spec.time_granularity.to_int()
-            ):
+            if time_dimension_spec.time_granularity.to_int() < time_spine_granularity.to_int():
                 raise RuntimeError(
                     f"Can't join to time spine for a time dimension with a smaller granularity than that of the time "
                     f"spine column. Got {time_dimension_spec.time_granularity} for time dimension, "
-                    f"{original_time_spine_dim_instance.spec.time_granularity} for time spine."
+                    f"{time_spine_granularity} for time spine."
                 )
 
             # Apply grain to time spine select expression, unless grain already matches original time spine column.
             select_expr: SqlExpressionNode = (
                 time_spine_column_select_expr
-                if time_dimension_spec.time_granularity == original_time_spine_dim_instance.spec.time_granularity
+                if time_dimension_spec.time_granularity == time_spine_granularity
                 else SqlDateTruncExpression(
                     time_granularity=time_dimension_spec.time_granularity, arg=time_spine_column_select_expr
                 )
             )
             # Filter down to one row per granularity period requested in the group by. Any other granularities
             # included here will be filtered out in later nodes so should not be included in where filter.
-            if need_where_filter and time_dimension_spec in node.requested_agg_time_dimension_specs:
-                new_where_filter = SqlComparisonExpression(
-                    left_expr=select_expr, comparison=SqlComparison.EQUALS, right_expr=time_spine_column_select_expr
-                )
-                where_filter = (
-                    SqlLogicalExpression(operator=SqlLogicalOperator.OR, args=(where_filter, new_where_filter))
-                    if where_filter
-                    else new_where_filter
+            if need_where_filter and time_dimension_spec in requested_agg_time_dimension_spec_set:
+                where_filter_args.append(
+                    SqlComparisonExpression(
+                        left_expr=select_expr, comparison=SqlComparison.EQUALS, right_expr=time_spine_column_select_expr
+                    )
                 )
 
             # Apply date_part to time spine column select expression.
             if time_dimension_spec.date_part:
                 select_expr = SqlExtractExpression(date_part=time_dimension_spec.date_part, arg=select_expr)
             time_dim_spec = TimeDimensionSpec(
-                element_name=original_time_spine_dim_instance.spec.element_name,
-                entity_links=original_time_spine_dim_instance.spec.entity_links,
+                element_name=original_time_spine_dim_spec.element_name,
+                entity_links=original_time_spine_dim_spec.entity_links,
                 time_granularity=time_dimension_spec.time_granularity,
                 date_part=time_dimension_spec.date_part,
-                aggregation_state=original_time_spine_dim_instance.spec.aggregation_state,
+                aggregation_state=original_time_spine_dim_spec.aggregation_state,
             )
             time_spine_dim_instance = TimeDimensionInstance(
                 defined_from=original_time_spine_dim_instance.defined_from,
-                associated_columns=(self._column_association_resolver.resolve_spec(time_dim_spec),),
+                associated_columns=(resolve_spec(time_dim_spec),),
                 spec=time_dim_spec,
             )
-            time_spine_dim_instances.append(time_spine_dim_instance)
+            spec_to_time_spine_dim_instance.setdefault(time_dim_spec, time_spine_dim_instance)
             time_spine_select_columns.append(
                 SqlSelectColumn(expr=select_expr, column_alias=time_spine_dim_instance.associated_column.column_name)
             )
-        time_spine_instance_set = InstanceSet(time_dimension_instances=tuple(time_spine_dim_instances))
+
+        # Combine the filters for each granularity with a single OR instead of nesting them.
+        where_filter: Optional[SqlExpressionNode] = None
+        if len(where_filter_args) == 1:
+            where_filter = where_filter_args[0]
+        elif len(where_filter_args) > 1:
+            where_filter = SqlLogicalExpression(operator=SqlLogicalOperator.OR, args=tuple(where_filter_args))
 
         return SqlDataSet(
-            instance_set=InstanceSet.merge([time_spine_instance_set, parent_instance_set]),
+            # The time spine instances don't overlap with the parent's since the agg_time_dimensions were excluded
+            # from the parent instances, so the instance set can be built directly instead of merged.
+            instance_set=InstanceSet(
+                measure_instances=parent_instance_set.measure_instances,
+                dimension_instances=parent_instance_set.dimension_instances,
+                time_dimension_instances=tuple(spec_to_time_spine_dim_instance.values())
+                + parent_instance_set.time_dimension_instances,
+                entity_instances=parent_instance_set.entity_instances,
+                metric_instances=parent_instance_set.metric_instances,
+                metadata_instances=parent_instance_set.metadata_instances,
+            ),
             sql_select_node=SqlSelectStatementNode(
                 description=node.description,
                 select_columns=tuple(time_spine_select_columns) + parent_select_columns,
@@ -1456,23 +1553,20 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
         conversion_data_set: SqlDataSet = node.conversion_node.accept(self)
         conversion_data_set_alias = self._next_unique_table_alias()
 
-        base_time_dimension_column_name = self._column_association_resolver.resolve_spec(
-            node.base_time_dimension_spec
-        ).column_name
-        conversion_time_dimension_column_name = self._column_association_resolver.resolve_spec(
-            node.conversion_time_dimension_spec
-        ).column_name
-        entity_column_name = self._column_association_resolver.resolve_spec(node.entity_spec).column_name
-
-        constant_property_column_names: List[Tuple[str, str]] = []
-        for constant_property in node.constant_properties or []:
-            base_property_col_name = self._column_association_resolver.resolve_spec(
-                constant_property.base_spec
-            ).column_name
-            conversion_property_col_name = self._column_association_resolver.resolve_spec(
-                constant_property.conversion_spec
-            ).column_name
-            constant_property_column_names.append((base_property_col_name, conversion_property_col_name))
+        # Resolve all the column names needed for the join and the window functions up front.
+        resolve_spec = self._column_association_resolver.resolve_spec
+        base_time_dimension_column_name = resolve_spec(node.base_time_dimension_spec).column_name
+        conversion_time_dimension_column_name = resolve_spec(node.conversion_time_dimension_spec).column_name
+        entity_column_name = resolve_spec(node.entity_spec).column_name
+        unique_conversion_col_names = tuple(resolve_spec(spec).column_name for spec in node.unique_identifier_keys)
+
+        constant_property_column_names: List[Tuple[str, str]] = [
+            (
+                resolve_spec(constant_property.base_spec).column_name,
+                resolve_spec(constant_property.conversion_spec).column_name,
+            )
+            for constant_property in node.constant_properties or []
+        ]
 
         # Builds the join conditions that is required for a successful conversion
         sql_join_description = SqlQueryPlanJoinBuilder.make_join_conversion_join_description(
@@ -1504,15 +1598,10 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
             CreateSqlColumnReferencesForInstances(base_data_set_alias, self._column_association_resolver)
         )
 
-        unique_conversion_col_names = tuple(
-            self._column_association_resolver.resolve_spec(spec).column_name for spec in node.unique_identifier_keys
-        )
-        partition_by_columns: Tuple[str, ...] = (
-            entity_column_name,
-            conversion_time_dimension_column_name,
-        ) + unique_conversion_col_names
+        partition_by_columns: List[str] = [entity_column_name, conversion_time_dimension_column_name]
+        partition_by_columns.extend(unique_conversion_col_names)
         if node.constant_properties:
-            partition_by_columns += tuple(
+            partition_by_columns.extend(
                 conversion_column_name for _, conversion_column_name in constant_property_column_names
             )
         base_sql_select_columns = tuple(
@@ -1586,16 +1675,15 @@ class DataflowToSqlQueryPlanConverter(DataflowPlanNodeVisitor[SqlDataSet]):
 
         # Returns the original dataset with all the successful conversion
         output_data_set_alias = self._next_unique_table_alias()
-        output_instance_set = ChangeAssociatedColumns(self._column_association_resolver).transform(
-            InstanceSet.merge([conversion_data_set_output_instance_set, base_data_set.instance_set])
+        merged_instance_set = InstanceSet.merge([conversion_data_set_output_instance_set, base_data_set.instance_set])
+        output_instance_set, output_select_column_set = merged_instance_set.transform(
+            ChangeAssociatedColumnsAndCreateSelectColumns(output_data_set_alias, self._column_association_resolver)
         )
         return SqlDataSet(
             instance_set=output_instance_set,
             sql_select_node=SqlSelectStatementNode(
                 description=node.description,
-                select_columns=output_instance_set.transform(
-                    CreateSelectColumnsForInstances(output_data_set_alias, self._column_association_resolver)
-                ).as_tuple(),
+                select_columns=output_select_column_set.as_tuple(),
                 from_source=deduped_sql_select_node,
                 from_source_alias=output_data_set_alias,
             ),
@@ -3,9 +3,7 @@
 from __future__ import annotations
 
 import logging
-from collections import OrderedDict
 from dataclasses import dataclass
-from itertools import chain
 from typing import Dict, List, Optional, Sequence, Tuple
 
 from dbt_semantic_interfaces.references import MetricReference, SemanticModelReference
@@ -28,7 +26,7 @@ from metricflow_semantics.instances import (
 )
 from metricflow_semantics.model.semantics.metric_lookup import MetricLookup
 from metricflow_semantics.model.semantics.semantic_model_lookup import SemanticModelLookup
-from metricflow_semantics.specs.column_assoc import ColumnAssociationResolver
+from metricflow_semantics.specs.column_assoc import ColumnAssociation, ColumnAssociationResolver
 from metricflow_semantics.specs.spec_classes import (
     DimensionSpec,
     EntityReference,
@@ -73,7 +71,7 @@ class CreateSelectColumnsForInstances(InstanceSetTransform[SelectColumnSet]):
         self,
         table_alias: str,
         column_resolver: ColumnAssociationResolver,
-        output_to_input_column_mapping: Optional[OrderedDict[str, str]] = None,
+        output_to_input_column_mapping: Optional[Dict[str, str]] = None,
     ) -> None:
         """Initializer.
 
@@ -84,30 +82,16 @@ class CreateSelectColumnsForInstances(InstanceSetTransform[SelectColumnSet]):
         """
         self._table_alias = table_alias
         self._column_resolver = column_resolver
-        self._output_to_input_column_mapping = output_to_input_column_mapping or OrderedDict()
+        self._output_to_input_column_mapping = output_to_input_column_mapping or {}
 
     def transform(self, instance_set: InstanceSet) -> SelectColumnSet:  # noqa: D102
-        metric_cols = list(
-            chain.from_iterable([self._make_sql_column_expression(x) for x in instance_set.metric_instances])
-        )
-        measure_cols = list(
-            chain.from_iterable([self._make_sql_column_expression(x) for x in instance_set.measure_instances])
-        )
-        dimension_cols = list(
-            chain.from_iterable([self._make_sql_column_expression(x) for x in instance_set.dimension_instances])
-        )
-        time_dimension_cols = list(
-            chain.from_iterable([self._make_sql_column_expression(x) for x in instance_set.time_dimension_instances])
-        )
-        entity_cols = list(
-            chain.from_iterable([self._make_sql_column_expression(x) for x in instance_set.entity_instances])
-        )
-        metadata_cols = list(
-            chain.from_iterable([self._make_sql_column_expression(x) for x in instance_set.metadata_instances])
-        )
-        group_by_metric_cols = list(
-            chain.from_iterable([self._make_sql_column_expression(x) for x in instance_set.group_by_metric_instances])
-        )
+        metric_cols = self._make_sql_select_columns(instance_set.metric_instances)
+        measure_cols = self._make_sql_select_columns(instance_set.measure_instances)
+        dimension_cols = self._make_sql_select_columns(instance_set.dimension_instances)
+        time_dimension_cols = self._make_sql_select_columns(instance_set.time_dimension_instances)
+        entity_cols = self._make_sql_select_columns(instance_set.entity_instances)
+        metadata_cols = self._make_sql_select_columns(instance_set.metadata_instances)
+        group_by_metric_cols = self._make_sql_select_columns(instance_set.group_by_metric_instances)
         return SelectColumnSet(
             metric_columns=metric_cols,
             measure_columns=measure_cols,
@@ -118,51 +102,35 @@ class CreateSelectColumnsForInstances(InstanceSetTransform[SelectColumnSet]):
             metadata_columns=metadata_cols,
         )
 
-    def _make_sql_column_expression(
-        self,
-        element_instance: MdoInstance,
-    ) -> List[SqlSelectColumn]:
-        """Convert one element instance into a SQL column."""
-        # Do a sanity check to make sure that there's a 1:1 mapping between the columns associations generated by the
-        # column resolver based on the spec, and the columns that are already associated with the instance.
-        expected_column_associations = (self._column_resolver.resolve_spec(element_instance.spec),)
-        existing_column_associations = element_instance.associated_columns
-
-        # Dict between the expected column name and the corresponding column in the existing columns
-        column_matches: Dict[str, List[str]] = {
-            expected_column.column_name: [
-                col.column_name
-                for col in existing_column_associations
-                if col.column_correlation_key == expected_column.column_correlation_key
-            ]
-            for expected_column in expected_column_associations
-        }
-
-        # Assert a 1:1 mapping between expected and existing
-        assert all([len(x) == 1 for x in column_matches.values()]), (
-            f"Did not find exactly one match for each expected column associations.  "
-            f"Expected -> existing mappings: {column_matches}"
-        )
-        existing_names = set([col.column_name for col in existing_column_associations])
-        mapped_names = set()
-        mapped_cols: List[str] = []
-        for mapped_cols in column_matches.values():
-            mapped_names.update([col_name for col_name in mapped_cols])
-        assert existing_names == mapped_names, (
-            f"Not all existing columns were mapped. Existing: {existing_names}.  Mapped: {mapped_cols}, "
-            f"{expected_column_associations} -- {existing_column_associations}"
-        )
-
-        select_columns = []
-        for expected_name, mapped_cols in column_matches.items():
-            input_column_name = mapped_cols[0]
-            output_column_name = expected_name
+    def _make_sql_select_columns(self, element_instances: Sequence[MdoInstance]) -> List[SqlSelectColumn]:
+        """Convert the element instances into SQL columns, one per instance."""
+        # This is called for every instance in every node, so the lookups that are the same for all instances are
+        # bound to locals and intermediate collections are avoided.
+        resolve_spec = self._column_resolver.resolve_spec
+        table_alias = self._table_alias
+        output_to_input_column_mapping = self._output_to_input_column_mapping
+        select_columns: List[SqlSelectColumn] = []
+        for element_instance in element_instances:
+            # Do a sanity check to make sure that there's a 1:1 mapping between the column association generated by
+            # the column resolver based on the spec, and the columns that are already associated with the instance.
+            expected_column_association = resolve_spec(element_instance.spec)
+            existing_column_associations = element_instance.associated_columns
+            assert (
+                len(existing_column_associations) == 1
+                and existing_column_associations[0].column_correlation_key
+                == expected_column_association.column_correlation_key
+            ), (
+                f"Did not find exactly one match for the expected column association. "
+                f"Expected: {expected_column_association} Existing: {existing_column_associations}"
+            )
 
-            if output_column_name in self._output_to_input_column_mapping:
-                input_column_name = self._output_to_input_column_mapping[output_column_name]
+            output_column_name = expected_column_association.column_name
+            input_column_name = existing_column_associations[0].column_name
+            if output_to_input_column_mapping:
+                input_column_name = output_to_input_column_mapping.get(output_column_name, input_column_name)
             select_columns.append(
                 SqlSelectColumn(
-                    expr=SqlColumnReferenceExpression(SqlColumnReference(self._table_alias, input_column_name)),
+                    expr=SqlColumnReferenceExpression(SqlColumnReference(table_alias, input_column_name)),
                     column_alias=output_column_name,
                 )
             )
@@ -244,26 +212,14 @@ class CreateSelectColumnsWithMeasuresAggregated(CreateSelectColumnsForInstances)
         )
 
     def transform(self, instance_set: InstanceSet) -> SelectColumnSet:  # noqa: D102
-        metric_cols = list(
-            chain.from_iterable([self._make_sql_column_expression(x) for x in instance_set.metric_instances])
-        )
+        metric_cols = self._make_sql_select_columns(instance_set.metric_instances)
 
         measure_cols = self._make_sql_column_expression_to_aggregate_measures(instance_set.measure_instances)
-        dimension_cols = list(
-            chain.from_iterable([self._make_sql_column_expression(x) for x in instance_set.dimension_instances])
-        )
-        time_dimension_cols = list(
-            chain.from_iterable([self._make_sql_column_expression(x) for x in instance_set.time_dimension_instances])
-        )
-        entity_cols = list(
-            chain.from_iterable([self._make_sql_column_expression(x) for x in instance_set.entity_instances])
-        )
-        metadata_cols = list(
-            chain.from_iterable([self._make_sql_column_expression(x) for x in instance_set.metadata_instances])
-        )
-        group_by_metric_cols = list(
-            chain.from_iterable([self._make_sql_column_expression(x) for x in instance_set.group_by_metric_instances])
-        )
+        dimension_cols = self._make_sql_select_columns(instance_set.dimension_instances)
+        time_dimension_cols = self._make_sql_select_columns(instance_set.time_dimension_instances)
+        entity_cols = self._make_sql_select_columns(instance_set.entity_instances)
+        metadata_cols = self._make_sql_select_columns(instance_set.metadata_instances)
+        group_by_metric_cols = self._make_sql_select_columns(instance_set.group_by_metric_instances)
         return SelectColumnSet(
             metric_columns=metric_cols,
             measure_columns=measure_cols,
@@ -528,6 +484,22 @@ class FilterLinkableInstancesWithLeadingLink(InstanceSetTransform[InstanceSet]):
         return output
 
 
+class _SpecMembershipSet:
+    """Checks if a spec is equal to one of the given specs using a hash lookup where possible.
+
+    GroupByMetricSpec.__eq__ doesn't compare all the fields used in its hash, so those are checked by equality.
+    """
+
+    def __init__(self, specs: Sequence[InstanceSpec]) -> None:  # noqa: D107
+        self._hashable_specs = frozenset(spec for spec in specs if not isinstance(spec, GroupByMetricSpec))
+        self._group_by_metric_specs = tuple(spec for spec in specs if isinstance(spec, GroupByMetricSpec))
+
+    def contains(self, spec: InstanceSpec) -> bool:  # noqa: D102
+        if isinstance(spec, GroupByMetricSpec):
+            return any(x == spec for x in self._group_by_metric_specs)
+        return spec in self._hashable_specs
+
+
 class FilterElements(InstanceSetTransform[InstanceSet]):
     """Return an instance set with the elements that don't match any of the pass specs removed."""
 
@@ -545,33 +517,37 @@ class FilterElements(InstanceSetTransform[InstanceSet]):
         assert_exactly_one_arg_set(include_specs=include_specs, exclude_specs=exclude_specs)
         self._include_specs = include_specs
         self._exclude_specs = exclude_specs
+        # Sets for checking membership, since this is done for every instance in the input.
+        self._include_spec_set = _SpecMembershipSet(include_specs.all_specs if include_specs else ())
+        self._exclude_spec_set = _SpecMembershipSet(exclude_specs.all_specs if exclude_specs else ())
 
     def _should_pass(self, element_spec: InstanceSpec) -> bool:
-        # TODO: Use better matching function
         if self._include_specs:
-            return any(x == element_spec for x in self._include_specs.all_specs)
+            return self._include_spec_set.contains(element_spec)
         elif self._exclude_specs:
-            return not any(x == element_spec for x in self._exclude_specs.all_specs)
+            return not self._exclude_spec_set.contains(element_spec)
         assert False
 
     def transform(self, instance_set: InstanceSet) -> InstanceSet:  # noqa: D102
         # Sanity check to make sure the specs are in the instance set
-
+        instance_set_specs = _SpecMembershipSet(instance_set.spec_set.all_specs)
         if self._include_specs:
-            include_specs_not_found = []
-            for include_spec in self._include_specs.all_specs:
-                if include_spec not in instance_set.spec_set.all_specs:
-                    include_specs_not_found.append(include_spec)
+            include_specs_not_found = [
+                include_spec
+                for include_spec in self._include_specs.all_specs
+                if not instance_set_specs.contains(include_spec)
+            ]
             if include_specs_not_found:
                 raise RuntimeError(
                     f"Include specs {include_specs_not_found} are not in the spec set {instance_set.spec_set} - "
                     f"check if this node was constructed correctly."
                 )
         elif self._exclude_specs:
-            exclude_specs_not_found = []
-            for exclude_spec in self._exclude_specs.all_specs:
-                if exclude_spec not in instance_set.spec_set.all_specs:
-                    exclude_specs_not_found.append(exclude_spec)
+            exclude_specs_not_found = [
+                exclude_spec
+                for exclude_spec in self._exclude_specs.all_specs
+                if not instance_set_specs.contains(exclude_spec)
+            ]
             if exclude_specs_not_found:
                 raise RuntimeError(
                     f"Exclude specs {exclude_specs_not_found} are not in the spec set {instance_set.spec_set} - "
@@ -941,89 +917,122 @@ class ChangeAssociatedColumns(InstanceSetTransform[InstanceSet]):
         self._column_association_resolver = column_association_resolver
 
     def transform(self, instance_set: InstanceSet) -> InstanceSet:  # noqa: D102
-        output_measure_instances = []
-        for input_measure_instance in instance_set.measure_instances:
-            output_measure_instances.append(
+        # This is called for most nodes in the dataflow plan, so the resolver method is bound once and the output
+        # tuples are built directly.
+        resolve_spec = self._column_association_resolver.resolve_spec
+        # Usually the columns are already resolved when the parent node was also a pass-through node. Instance sets are
+        # immutable, so the input is returned in that case.
+        columns_changed = False
+
+        def _resolve_columns(instance: MdoInstance) -> Tuple[ColumnAssociation, ...]:
+            nonlocal columns_changed
+            associated_columns = (resolve_spec(instance.spec),)
+            if associated_columns != instance.associated_columns:
+                columns_changed = True
+            return associated_columns
+
+        output_instance_set = InstanceSet(
+            measure_instances=tuple(
                 MeasureInstance(
-                    associated_columns=(self._column_association_resolver.resolve_spec(input_measure_instance.spec),),
+                    associated_columns=_resolve_columns(input_measure_instance),
                     spec=input_measure_instance.spec,
                     defined_from=input_measure_instance.defined_from,
                     aggregation_state=input_measure_instance.aggregation_state,
                 )
-            )
-
-        output_dimension_instances = []
-        for input_dimension_instance in instance_set.dimension_instances:
-            output_dimension_instances.append(
+                for input_measure_instance in instance_set.measure_instances
+            ),
+            dimension_instances=tuple(
                 DimensionInstance(
-                    associated_columns=(self._column_association_resolver.resolve_spec(input_dimension_instance.spec),),
+                    associated_columns=_resolve_columns(input_dimension_instance),
                     spec=input_dimension_instance.spec,
                     defined_from=input_dimension_instance.defined_from,
                 )
-            )
-
-        output_time_dimension_instances = []
-        for input_time_dimension_instance in instance_set.time_dimension_instances:
-            output_time_dimension_instances.append(
+                for input_dimension_instance in instance_set.dimension_instances
+            ),
+            time_dimension_instances=tuple(
                 TimeDimensionInstance(
-                    associated_columns=(
-                        self._column_association_resolver.resolve_spec(input_time_dimension_instance.spec),
-                    ),
+                    associated_columns=_resolve_columns(input_time_dimension_instance),
                     spec=input_time_dimension_instance.spec,
                     defined_from=input_time_dimension_instance.defined_from,
                 )
-            )
-
-        output_entity_instances = []
-        for input_entity_instance in instance_set.entity_instances:
-            output_entity_instances.append(
+                for input_time_dimension_instance in instance_set.time_dimension_instances
+            ),
+            entity_instances=tuple(
                 EntityInstance(
-                    associated_columns=(self._column_association_resolver.resolve_spec(input_entity_instance.spec),),
+                    associated_columns=_resolve_columns(input_entity_instance),
                     spec=input_entity_instance.spec,
                     defined_from=input_entity_instance.defined_from,
                 )
-            )
-
-        output_metric_instances = []
-        for input_metric_instance in instance_set.metric_instances:
-            output_metric_instances.append(
+                for input_entity_instance in instance_set.entity_instances
+            ),
+            group_by_metric_instances=tuple(
+                GroupByMetricInstance(
+                    associated_columns=_resolve_columns(input_group_by_metric_instance),
+                    spec=input_group_by_metric_instance.spec,
+                    defined_from=input_group_by_metric_instance.defined_from,
+                )
+                for input_group_by_metric_instance in instance_set.group_by_metric_instances
+            ),
+            metric_instances=tuple(
                 MetricInstance(
-                    associated_columns=(self._column_association_resolver.resolve_spec(input_metric_instance.spec),),
+                    associated_columns=_resolve_columns(input_metric_instance),
                     spec=input_metric_instance.spec,
                     defined_from=input_metric_instance.defined_from,
                 )
-            )
-
-        output_metadata_instances = []
-        for input_metadata_instance in instance_set.metadata_instances:
-            output_metadata_instances.append(
+                for input_metric_instance in instance_set.metric_instances
+            ),
+            metadata_instances=tuple(
                 MetadataInstance(
-                    associated_columns=(self._column_association_resolver.resolve_spec(input_metadata_instance.spec),),
+                    associated_columns=_resolve_columns(input_metadata_instance),
                     spec=input_metadata_instance.spec,
                 )
-            )
+                for input_metadata_instance in instance_set.metadata_instances
+            ),
+        )
+        return output_instance_set if columns_changed else instance_set
 
-        output_group_by_metric_instances = []
-        for input_group_by_metric_instance in instance_set.group_by_metric_instances:
-            output_group_by_metric_instances.append(
-                GroupByMetricInstance(
-                    associated_columns=(
-                        self._column_association_resolver.resolve_spec(input_group_by_metric_instance.spec),
-                    ),
-                    spec=input_group_by_metric_instance.spec,
-                    defined_from=input_group_by_metric_instance.defined_from,
-                )
-            )
-        return InstanceSet(
-            measure_instances=tuple(output_measure_instances),
-            dimension_instances=tuple(output_dimension_instances),
-            time_dimension_instances=tuple(output_time_dimension_instances),
-            entity_instances=tuple(output_entity_instances),
-            group_by_metric_instances=tuple(output_group_by_metric_instances),
-            metric_instances=tuple(output_metric_instances),
-            metadata_instances=tuple(output_metadata_instances),
+
+class ChangeAssociatedColumnsAndCreateSelectColumns(InstanceSetTransform[Tuple[InstanceSet, SelectColumnSet]]):
+    """Combines ChangeAssociatedColumns and CreateSelectColumnsForInstances for pass-through nodes.
+
+    Pass-through nodes select all columns from the parent data set and the output columns follow the resolver format.
+    Since the columns of the output instances are resolved here, the select columns are built from those directly
+    instead of resolving every spec again and checking it against the instance.
+    """
+
+    def __init__(self, table_alias: str, column_association_resolver: ColumnAssociationResolver) -> None:
+        """Initializer.
+
+        Args:
+            table_alias: the table alias to select columns from.
+            column_association_resolver: resolver to name columns.
+        """
+        self._table_alias = table_alias
+        self._column_association_resolver = column_association_resolver
+
+    def transform(self, instance_set: InstanceSet) -> Tuple[InstanceSet, SelectColumnSet]:  # noqa: D102
+        output_instance_set = ChangeAssociatedColumns(self._column_association_resolver).transform(instance_set)
+        return output_instance_set, SelectColumnSet(
+            metric_columns=self._make_select_columns(output_instance_set.metric_instances),
+            measure_columns=self._make_select_columns(output_instance_set.measure_instances),
+            dimension_columns=self._make_select_columns(output_instance_set.dimension_instances),
+            time_dimension_columns=self._make_select_columns(output_instance_set.time_dimension_instances),
+            entity_columns=self._make_select_columns(output_instance_set.entity_instances),
+            group_by_metric_columns=self._make_select_columns(output_instance_set.group_by_metric_instances),
+            metadata_columns=self._make_select_columns(output_instance_set.metadata_instances),
         )
 
+    def _make_select_columns(self, instances: Sequence[MdoInstance]) -> List[SqlSelectColumn]:
+        table_alias = self._table_alias
+        return [
+            SqlSelectColumn(
+                expr=SqlColumnReferenceExpression(SqlColumnReference(table_alias, column_association.column_name)),
+                column_alias=column_association.column_name,
+            )
+            for instance in instances
+            for column_association in instance.associated_columns
+        ]
+
 
 class ConvertToMetadata(InstanceSetTransform[InstanceSet]):
     """Removes all instances from old instance set and replaces them with a set of metadata instances."""
@@ -1039,24 +1048,21 @@ class ConvertToMetadata(InstanceSetTransform[InstanceSet]):
 
 def create_select_columns_for_instance_sets(
     column_resolver: ColumnAssociationResolver,
-    table_alias_to_instance_set: OrderedDict[str, InstanceSet],
+    table_alias_to_instance_set: Dict[str, InstanceSet],
 ) -> Tuple[SqlSelectColumn, ...]:
     """Creates select columns for instance sets coming from multiple table as defined in table_alias_to_instance_set.
 
     Used in cases where you join multiple tables and need to render select columns to access all of those.
     """
-    column_set = SelectColumnSet()
-    for table_alias, instance_set in table_alias_to_instance_set.items():
-        column_set = column_set.merge(
-            instance_set.transform(
-                CreateSelectColumnsForInstances(
-                    table_alias=table_alias,
-                    column_resolver=column_resolver,
-                )
+    return SelectColumnSet.merge_all(
+        instance_set.transform(
+            CreateSelectColumnsForInstances(
+                table_alias=table_alias,
+                column_resolver=column_resolver,
             )
         )
-
-    return column_set.as_tuple()
+        for table_alias, instance_set in table_alias_to_instance_set.items()
+    ).as_tuple()
 
 
 class AddMetadata(InstanceSetTransform[InstanceSet]):
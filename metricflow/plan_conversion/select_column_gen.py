@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass, field
-from typing import List, Tuple
+from typing import Iterable, List, Tuple
 
 from metricflow.sql.sql_plan import SqlSelectColumn
 
@@ -33,6 +33,38 @@ class SelectColumnSet:
             metadata_columns=self.metadata_columns + other_set.metadata_columns,
         )
 
+    @staticmethod
+    def merge_all(select_column_sets: Iterable[SelectColumnSet]) -> SelectColumnSet:
+        """Combine the select columns from all sets by type.
+
+        This is equivalent to chaining merge() calls, but avoids copying the columns into an intermediate set per call.
+        """
+        metric_columns: List[SqlSelectColumn] = []
+        measure_columns: List[SqlSelectColumn] = []
+        dimension_columns: List[SqlSelectColumn] = []
+        time_dimension_columns: List[SqlSelectColumn] = []
+        entity_columns: List[SqlSelectColumn] = []
+        group_by_metric_columns: List[SqlSelectColumn] = []
+        metadata_columns: List[SqlSelectColumn] = []
+        for select_column_set in select_column_sets:
+            metric_columns.extend(select_column_set.metric_columns)
+            measure_columns.extend(select_column_set.measure_columns)
+            dimension_columns.extend(select_column_set.dimension_columns)
+            time_dimension_columns.extend(select_column_set.time_dimension_columns)
+            entity_columns.extend(select_column_set.entity_columns)
+            group_by_metric_columns.extend(select_column_set.group_by_metric_columns)
+            metadata_columns.extend(select_column_set.metadata_columns)
+
+        return SelectColumnSet(
+            metric_columns=metric_columns,
+            measure_columns=measure_columns,
+            dimension_columns=dimension_columns,
+            time_dimension_columns=time_dimension_columns,
+            entity_columns=entity_columns,
+            group_by_metric_columns=group_by_metric_columns,
+            metadata_columns=metadata_columns,
+        )
+
     def as_tuple(self) -> Tuple[SqlSelectColumn, ...]:
         """Return all select columns as a tuple."""
         return tuple(
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 from enum import Enum
 from typing import Sequence
 
@@ -24,10 +25,14 @@ class SqlQueryOptimizerConfiguration:
     """Defines the different optimizers that should be used at each level."""
 
     @staticmethod
+    @functools.lru_cache
     def optimizers_for_level(
         level: SqlQueryOptimizationLevel, use_column_alias_in_group_by: bool
     ) -> Sequence[SqlQueryPlanOptimizer]:
-        """Return the optimizers that should be applied (in order) for each level."""
+        """Return the optimizers that should be applied (in order) for each level.
+
+        The optimizers don't keep state between calls to optimize(), so the result is cached and shared.
+        """
         if level is SqlQueryOptimizationLevel.O0:
             return ()
         elif level is SqlQueryOptimizationLevel.O1:
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import Sequence, Tuple
+
+import pytest
+from dbt_semantic_interfaces.references import SemanticModelElementReference
+from dbt_semantic_interfaces.type_enums.time_granularity import TimeGranularity
+from metricflow_semantics.instances import InstanceSet, TimeDimensionInstance
+from metricflow_semantics.specs.column_assoc import ColumnAssociation
+from metricflow_semantics.specs.spec_classes import TimeDimensionSpec
+
+from metricflow.dataset.sql_dataset import SqlDataSet
+from metricflow.sql.sql_exprs import SqlColumnReference, SqlColumnReferenceExpression
+from metricflow.sql.sql_plan import SqlSelectColumn, SqlSelectStatementNode, SqlTableFromClauseNode
+from metricflow.sql.sql_table import SqlTable
+
+_DS_DAY_SPEC = TimeDimensionSpec(element_name="ds", entity_links=(), time_granularity=TimeGranularity.DAY)
+_DS_MONTH_SPEC = TimeDimensionSpec(element_name="ds", entity_links=(), time_granularity=TimeGranularity.MONTH)
+
+
+def _make_data_set(column_names_and_specs: Sequence[Tuple[str, TimeDimensionSpec]]) -> SqlDataSet:
+    return SqlDataSet(
+        instance_set=InstanceSet(
+            time_dimension_instances=tuple(
+                TimeDimensionInstance(
+                    associated_columns=(ColumnAssociation(column_name),),
+                    defined_from=(SemanticModelElementReference(semantic_model_name="bookings", element_name="ds"),),
+                    spec=spec,
+                )
+                for column_name, spec in column_names_and_specs
+            ),
+        ),
+        sql_select_node=SqlSelectStatementNode(
+            description="test",
+            select_columns=tuple(
+                SqlSelectColumn(
+                    expr=SqlColumnReferenceExpression(SqlColumnReference(table_alias="src", column_name=column_name)),
+                    column_alias=column_name,
+                )
+                for column_name, _ in column_names_and_specs
+            ),
+            from_source=SqlTableFromClauseNode(sql_table=SqlTable(schema_name="demo", table_name="fct_bookings")),
+            from_source_alias="src",
+        ),
+    )
+
+
+def test_column_association_for_time_dimension() -> None:  # noqa: D103
+    data_set = _make_data_set((("ds__day", _DS_DAY_SPEC), ("ds__month", _DS_MONTH_SPEC)))
+
+    assert data_set.column_association_for_time_dimension(_DS_DAY_SPEC).column_name == "ds__day"
+    assert data_set.column_association_for_time_dimension(_DS_MONTH_SPEC).column_name == "ds__month"
+
+
+def test_column_association_for_missing_time_dimension() -> None:  # noqa: D103
+    data_set = _make_data_set((("ds__day", _DS_DAY_SPEC),))
+
+    with pytest.raises(RuntimeError, match="No time dimension instances"):
+        data_set.column_association_for_time_dimension(_DS_MONTH_SPEC)
+
+
+def test_column_association_for_duplicate_time_dimension() -> None:  # noqa: D103
+    data_set = _make_data_set((("ds__day", _DS_DAY_SPEC), ("ds__month", _DS_MONTH_SPEC), ("ds_copy", _DS_DAY_SPEC)))
+
+    assert data_set.time_dimension_instances_for_spec(_DS_DAY_SPEC)[0].associated_column.column_name == "ds__day"
+    with pytest.raises(RuntimeError, match="More than one time dimension instance"):
+        data_set.column_association_for_time_dimension(_DS_DAY_SPEC)
+    assert data_set.column_association_for_time_dimension(_DS_MONTH_SPEC).column_name == "ds__month"
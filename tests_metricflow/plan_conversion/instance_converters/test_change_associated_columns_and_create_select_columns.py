@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import Mapping, Tuple
+
+from metricflow_semantics.model.semantic_manifest_lookup import SemanticManifestLookup
+from metricflow_semantics.specs.dunder_column_association_resolver import DunderColumnAssociationResolver
+
+from metricflow.plan_conversion.instance_converters import (
+    ChangeAssociatedColumns,
+    ChangeAssociatedColumnsAndCreateSelectColumns,
+    CreateSelectColumnsForInstances,
+)
+from metricflow.sql.sql_exprs import SqlColumnReferenceExpression
+from metricflow.sql.sql_plan import SqlSelectColumn
+from tests_metricflow.fixtures.manifest_fixtures import MetricFlowEngineTestFixture, SemanticManifestSetup
+
+__SOURCE_TABLE_ALIAS = "a"
+
+
+def __column_descriptions(select_columns: Tuple[SqlSelectColumn, ...]) -> Tuple[Tuple[str, str, str], ...]:
+    descriptions = []
+    for select_column in select_columns:
+        expr = select_column.expr
+        assert isinstance(expr, SqlColumnReferenceExpression)
+        descriptions.append((expr.col_ref.table_alias, expr.col_ref.column_name, select_column.column_alias))
+    return tuple(descriptions)
+
+
+def test_matches_separate_transforms(
+    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture],
+    simple_semantic_manifest_lookup: SemanticManifestLookup,
+) -> None:
+    """Checks that the combined transform produces the same output as applying the two transforms in sequence."""
+    instance_set = (
+        mf_engine_test_fixture_mapping[SemanticManifestSetup.SIMPLE_MANIFEST]
+        .data_set_mapping["bookings_source"]
+        .instance_set
+    )
+    column_association_resolver = DunderColumnAssociationResolver(simple_semantic_manifest_lookup)
+
+    expected_instance_set = instance_set.transform(ChangeAssociatedColumns(column_association_resolver))
+    expected_select_columns = expected_instance_set.transform(
+        CreateSelectColumnsForInstances(__SOURCE_TABLE_ALIAS, column_association_resolver)
+    ).as_tuple()
+
+    output_instance_set, select_column_set = instance_set.transform(
+        ChangeAssociatedColumnsAndCreateSelectColumns(__SOURCE_TABLE_ALIAS, column_association_resolver)
+    )
+
+    assert output_instance_set == expected_instance_set
+    assert len(select_column_set.as_tuple()) > 0
+    assert __column_descriptions(select_column_set.as_tuple()) == __column_descriptions(expected_select_columns)
+
+
+def test_change_associated_columns_reuses_resolved_instance_set(
+    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture],
+    simple_semantic_manifest_lookup: SemanticManifestLookup,
+) -> None:
+    """Checks that an instance set with columns that already follow the resolver is returned as is."""
+    instance_set = (
+        mf_engine_test_fixture_mapping[SemanticManifestSetup.SIMPLE_MANIFEST]
+        .data_set_mapping["bookings_source"]
+        .instance_set
+    )
+    transform = ChangeAssociatedColumns(DunderColumnAssociationResolver(simple_semantic_manifest_lookup))
+
+    resolved_instance_set = instance_set.transform(transform)
+
+    assert resolved_instance_set.transform(transform) is resolved_instance_set
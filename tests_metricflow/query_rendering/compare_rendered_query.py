@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from _pytest.fixtures import FixtureRequest
 from metricflow_semantics.dag.mf_dag import DagId
+from metricflow_semantics.mf_logging.runtime import log_block_runtime
 from metricflow_semantics.test_helpers.config_helpers import MetricFlowTestConfiguration
 
 from metricflow.dataflow.dataflow_plan import DataflowPlanNode
@@ -23,15 +24,19 @@ def convert_and_check(
 ) -> None:
     """Renders an engine-specific query output from a DataflowPlanNode DataFlowPlan node.
 
+    The conversion and the snapshot check for each optimization level are logged with their runtimes, so running
+    with --log-cli-level=INFO shows which phase dominates a slow test. Plan building is logged by DataflowPlanBuilder.
+
     TODO: refine interface once file move operations are complete.
     """
     # Run dataflow -> sql conversion without optimizers
-    conversion_result = dataflow_to_sql_converter.convert_to_sql_query_plan(
-        sql_engine_type=sql_client.sql_engine_type,
-        dataflow_plan_node=node,
-        optimization_level=SqlQueryOptimizationLevel.O0,
-        sql_query_plan_id=DagId.from_str("plan0"),
-    )
+    with log_block_runtime("convert_to_sql_query_plan at O0"):
+        conversion_result = dataflow_to_sql_converter.convert_to_sql_query_plan(
+            sql_engine_type=sql_client.sql_engine_type,
+            dataflow_plan_node=node,
+            optimization_level=SqlQueryOptimizationLevel.O0,
+            sql_query_plan_id=DagId.from_str("plan0"),
+        )
     sql_query_plan = conversion_result.sql_plan
     display_graph_if_requested(
         request=request,
@@ -39,20 +44,22 @@ def convert_and_check(
         dag_graph=sql_query_plan,
     )
 
-    assert_rendered_sql_from_plan_equal(
-        request=request,
-        mf_test_configuration=mf_test_configuration,
-        sql_query_plan=sql_query_plan,
-        sql_client=sql_client,
-    )
+    with log_block_runtime("snapshot check for the O0 plan"):
+        assert_rendered_sql_from_plan_equal(
+            request=request,
+            mf_test_configuration=mf_test_configuration,
+            sql_query_plan=sql_query_plan,
+            sql_client=sql_client,
+        )
 
     # Run dataflow -> sql conversion with optimizers
-    conversion_result = dataflow_to_sql_converter.convert_to_sql_query_plan(
-        sql_engine_type=sql_client.sql_engine_type,
-        dataflow_plan_node=node,
-        optimization_level=SqlQueryOptimizationLevel.O4,
-        sql_query_plan_id=DagId.from_str("plan0_optimized"),
-    )
+    with log_block_runtime("convert_to_sql_query_plan at O4"):
+        conversion_result = dataflow_to_sql_converter.convert_to_sql_query_plan(
+            sql_engine_type=sql_client.sql_engine_type,
+            dataflow_plan_node=node,
+            optimization_level=SqlQueryOptimizationLevel.O4,
+            sql_query_plan_id=DagId.from_str("plan0_optimized"),
+        )
     sql_query_plan = conversion_result.sql_plan
     display_graph_if_requested(
         request=request,
@@ -60,9 +67,10 @@ def convert_and_check(
         dag_graph=sql_query_plan,
     )
 
-    assert_rendered_sql_from_plan_equal(
-        request=request,
-        mf_test_configuration=mf_test_configuration,
-        sql_query_plan=sql_query_plan,
-        sql_client=sql_client,
-    )
+    with log_block_runtime("snapshot check for the O4 plan"):
+        assert_rendered_sql_from_plan_equal(
+            request=request,
+            mf_test_configuration=mf_test_configuration,
+            sql_query_plan=sql_query_plan,
+            sql_client=sql_client,
+        )
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Mapping
+import datetime
 
 import pytest
 from _pytest.fixtures import FixtureRequest
@@ -21,9 +21,28 @@ from metricflow_semantics.test_helpers.metric_time_dimension import MTD_SPEC_DAY
 from metricflow.dataflow.builder.dataflow_plan_builder import DataflowPlanBuilder
 from metricflow.plan_conversion.dataflow_to_sql import DataflowToSqlQueryPlanConverter
 from metricflow.protocols.sql_client import SqlClient
-from tests_metricflow.fixtures.manifest_fixtures import MetricFlowEngineTestFixture, SemanticManifestSetup
 from tests_metricflow.query_rendering.compare_rendered_query import convert_and_check
 
+_TRAILING_2_MONTHS_REVENUE_SPEC = MetricSpec(element_name="trailing_2_months_revenue")
+_REVENUE_ALL_TIME_SPEC = MetricSpec(element_name="revenue_all_time")
+_REVENUE_MTD_SPEC = MetricSpec(element_name="revenue_mtd")
+_TRAILING_3_MONTHS_BOOKINGS_SPEC = MetricSpec(element_name="trailing_3_months_bookings")
+_DS_DAY_SPEC = TimeDimensionSpec(element_name="ds", entity_links=(), time_granularity=TimeGranularity.DAY)
+_DS_MONTH_SPEC = TimeDimensionSpec(element_name="ds", entity_links=(), time_granularity=TimeGranularity.MONTH)
+_REVENUE_INSTANCE_DS_SPEC = TimeDimensionSpec(element_name="ds", entity_links=(EntityReference("revenue_instance"),))
+_JAN_1_2020_TIME_RANGE_CONSTRAINT = TimeRangeConstraint(
+    start_time=datetime.datetime(2020, 1, 1), end_time=datetime.datetime(2020, 1, 1)
+)
+_MAR_5_2020_TO_JAN_4_2021_TIME_RANGE_CONSTRAINT = TimeRangeConstraint(
+    start_time=as_datetime("2020-03-05"), end_time=as_datetime("2021-01-04")
+)
+_NON_ADJUSTABLE_METRIC_TIME_FILTER = PydanticWhereFilter(
+    where_sql_template=(
+        "{{ TimeDimension('metric_time', 'day') }} = '2020-01-03' "
+        "or {{ TimeDimension('metric_time', 'day') }} = '2020-01-07'"
+    )
+)
+
 
 @pytest.mark.sql_engine_snapshot
 def test_cumulative_metric(
@@ -31,21 +50,14 @@ def test_cumulative_metric(
     mf_test_configuration: MetricFlowTestConfiguration,
     dataflow_plan_builder: DataflowPlanBuilder,
     dataflow_to_sql_converter: DataflowToSqlQueryPlanConverter,
-    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture],
     sql_client: SqlClient,
 ) -> None:
     """Tests rendering a basic cumulative metric query."""
     dataflow_plan = dataflow_plan_builder.build_plan(
         MetricFlowQuerySpec(
-            metric_specs=(MetricSpec(element_name="trailing_2_months_revenue"),),
+            metric_specs=(_TRAILING_2_MONTHS_REVENUE_SPEC,),
             dimension_specs=(),
-            time_dimension_specs=(
-                TimeDimensionSpec(
-                    element_name="ds",
-                    entity_links=(),
-                    time_granularity=TimeGranularity.DAY,
-                ),
-            ),
+            time_dimension_specs=(_DS_DAY_SPEC,),
         )
     )
 
@@ -64,7 +76,6 @@ def test_cumulative_metric_with_time_constraint(
     mf_test_configuration: MetricFlowTestConfiguration,
     dataflow_plan_builder: DataflowPlanBuilder,
     dataflow_to_sql_converter: DataflowToSqlQueryPlanConverter,
-    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture],
     sql_client: SqlClient,
 ) -> None:
     """Tests rendering a cumulative metric query with an adjustable time constraint.
@@ -75,18 +86,10 @@ def test_cumulative_metric_with_time_constraint(
     """
     dataflow_plan = dataflow_plan_builder.build_plan(
         MetricFlowQuerySpec(
-            metric_specs=(MetricSpec(element_name="trailing_2_months_revenue"),),
+            metric_specs=(_TRAILING_2_MONTHS_REVENUE_SPEC,),
             dimension_specs=(),
-            time_dimension_specs=(
-                TimeDimensionSpec(
-                    element_name="metric_time",
-                    entity_links=(),
-                    time_granularity=TimeGranularity.DAY,
-                ),
-            ),
-            time_range_constraint=TimeRangeConstraint(
-                start_time=as_datetime("2020-01-01"), end_time=as_datetime("2020-01-01")
-            ),
+            time_dimension_specs=(MTD_SPEC_DAY,),
+            time_range_constraint=_JAN_1_2020_TIME_RANGE_CONSTRAINT,
         )
     )
 
@@ -107,7 +110,6 @@ def test_cumulative_metric_with_non_adjustable_time_filter(
     query_parser: MetricFlowQueryParser,
     dataflow_plan_builder: DataflowPlanBuilder,
     dataflow_to_sql_converter: DataflowToSqlQueryPlanConverter,
-    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture],
     sql_client: SqlClient,
 ) -> None:
     """Tests rendering a cumulative metric query with a time filter that cannot be automatically adjusted.
@@ -119,12 +121,7 @@ def test_cumulative_metric_with_non_adjustable_time_filter(
     query_spec = query_parser.parse_and_validate_query(
         metric_names=("every_two_days_bookers",),
         group_by_names=(METRIC_TIME_ELEMENT_NAME,),
-        where_constraint=PydanticWhereFilter(
-            where_sql_template=(
-                "{{ TimeDimension('metric_time', 'day') }} = '2020-01-03' "
-                "or {{ TimeDimension('metric_time', 'day') }} = '2020-01-07'"
-            )
-        ),
+        where_constraint=_NON_ADJUSTABLE_METRIC_TIME_FILTER,
     ).query_spec
     dataflow_plan = dataflow_plan_builder.build_plan(query_spec)
 
@@ -143,13 +140,12 @@ def test_cumulative_metric_no_ds(
     mf_test_configuration: MetricFlowTestConfiguration,
     dataflow_plan_builder: DataflowPlanBuilder,
     dataflow_to_sql_converter: DataflowToSqlQueryPlanConverter,
-    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture],
     sql_client: SqlClient,
 ) -> None:
     """Tests rendering a cumulative metric with no time dimension specified."""
     dataflow_plan = dataflow_plan_builder.build_plan(
         MetricFlowQuerySpec(
-            metric_specs=(MetricSpec(element_name="trailing_2_months_revenue"),),
+            metric_specs=(_TRAILING_2_MONTHS_REVENUE_SPEC,),
             dimension_specs=(),
             time_dimension_specs=(),
         )
@@ -170,21 +166,14 @@ def test_cumulative_metric_no_window(
     mf_test_configuration: MetricFlowTestConfiguration,
     dataflow_plan_builder: DataflowPlanBuilder,
     dataflow_to_sql_converter: DataflowToSqlQueryPlanConverter,
-    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture],
     sql_client: SqlClient,
 ) -> None:
     """Tests rendering a query where there is a windowless cumulative metric to compute."""
     dataflow_plan = dataflow_plan_builder.build_plan(
         MetricFlowQuerySpec(
-            metric_specs=(MetricSpec(element_name="revenue_all_time"),),
+            metric_specs=(_REVENUE_ALL_TIME_SPEC,),
             dimension_specs=(),
-            time_dimension_specs=(
-                TimeDimensionSpec(
-                    element_name="ds",
-                    entity_links=(),
-                    time_granularity=TimeGranularity.MONTH,
-                ),
-            ),
+            time_dimension_specs=(_DS_MONTH_SPEC,),
         )
     )
 
@@ -203,18 +192,15 @@ def test_cumulative_metric_no_window_with_time_constraint(
     mf_test_configuration: MetricFlowTestConfiguration,
     dataflow_plan_builder: DataflowPlanBuilder,
     dataflow_to_sql_converter: DataflowToSqlQueryPlanConverter,
-    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture],
     sql_client: SqlClient,
 ) -> None:
     """Tests rendering a query for a windowless cumulative metric query with an adjustable time constraint."""
     dataflow_plan = dataflow_plan_builder.build_plan(
         MetricFlowQuerySpec(
-            metric_specs=(MetricSpec(element_name="revenue_all_time"),),
+            metric_specs=(_REVENUE_ALL_TIME_SPEC,),
             dimension_specs=(),
             time_dimension_specs=(MTD_SPEC_DAY,),
-            time_range_constraint=TimeRangeConstraint(
-                start_time=as_datetime("2020-01-01"), end_time=as_datetime("2020-01-01")
-            ),
+            time_range_constraint=_JAN_1_2020_TIME_RANGE_CONSTRAINT,
         )
     )
 
@@ -233,21 +219,14 @@ def test_cumulative_metric_grain_to_date(
     mf_test_configuration: MetricFlowTestConfiguration,
     dataflow_plan_builder: DataflowPlanBuilder,
     dataflow_to_sql_converter: DataflowToSqlQueryPlanConverter,
-    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture],
     sql_client: SqlClient,
 ) -> None:
     """Tests rendering a query against a grain_to_date cumulative metric."""
     dataflow_plan = dataflow_plan_builder.build_plan(
         MetricFlowQuerySpec(
-            metric_specs=(MetricSpec(element_name="revenue_mtd"),),
+            metric_specs=(_REVENUE_MTD_SPEC,),
             dimension_specs=(),
-            time_dimension_specs=(
-                TimeDimensionSpec(
-                    element_name="ds",
-                    entity_links=(),
-                    time_granularity=TimeGranularity.MONTH,
-                ),
-            ),
+            time_dimension_specs=(_DS_MONTH_SPEC,),
         )
     )
 
@@ -266,18 +245,15 @@ def test_cumulative_metric_month(
     mf_test_configuration: MetricFlowTestConfiguration,
     extended_date_dataflow_plan_builder: DataflowPlanBuilder,
     extended_date_dataflow_to_sql_converter: DataflowToSqlQueryPlanConverter,
-    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture],
     sql_client: SqlClient,
 ) -> None:
     """Tests rendering a query for a cumulative metric based on a monthly time dimension."""
     dataflow_plan = extended_date_dataflow_plan_builder.build_plan(
         MetricFlowQuerySpec(
-            metric_specs=(MetricSpec(element_name="trailing_3_months_bookings"),),
+            metric_specs=(_TRAILING_3_MONTHS_BOOKINGS_SPEC,),
             dimension_specs=(),
             time_dimension_specs=(MTD_SPEC_MONTH,),
-            time_range_constraint=TimeRangeConstraint(
-                start_time=as_datetime("2020-03-05"), end_time=as_datetime("2021-01-04")
-            ),
+            time_range_constraint=_MAR_5_2020_TO_JAN_4_2021_TIME_RANGE_CONSTRAINT,
         )
     )
 
@@ -296,17 +272,14 @@ def test_cumulative_metric_with_agg_time_dimension(
     mf_test_configuration: MetricFlowTestConfiguration,
     dataflow_plan_builder: DataflowPlanBuilder,
     dataflow_to_sql_converter: DataflowToSqlQueryPlanConverter,
-    mf_engine_test_fixture_mapping: Mapping[SemanticManifestSetup, MetricFlowEngineTestFixture],
     sql_client: SqlClient,
 ) -> None:
     """Tests rendering a query for a cumulative metric queried with agg time dimension."""
     dataflow_plan = dataflow_plan_builder.build_plan(
         MetricFlowQuerySpec(
-            metric_specs=(MetricSpec(element_name="trailing_2_months_revenue"),),
+            metric_specs=(_TRAILING_2_MONTHS_REVENUE_SPEC,),
             dimension_specs=(),
-            time_dimension_specs=(
-                TimeDimensionSpec(element_name="ds", entity_links=(EntityReference("revenue_instance"),)),
-            ),
+            time_dimension_specs=(_REVENUE_INSTANCE_DS_SPEC,),
         )
     )
 
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import copy
+from typing import Sequence
+
+import pytest
+from metricflow_semantics.dag.mf_dag import DagId
+
+from metricflow.sql.optimizer.optimization_levels import SqlQueryOptimizationLevel, SqlQueryOptimizerConfiguration
+from metricflow.sql.optimizer.sql_query_plan_optimizer import SqlQueryPlanOptimizer
+from metricflow.sql.render.sql_plan_renderer import DefaultSqlQueryPlanRenderer
+from metricflow.sql.sql_exprs import SqlColumnReference, SqlColumnReferenceExpression
+from metricflow.sql.sql_plan import (
+    SqlQueryPlan,
+    SqlQueryPlanNode,
+    SqlSelectColumn,
+    SqlSelectStatementNode,
+    SqlTableFromClauseNode,
+)
+from metricflow.sql.sql_table import SqlTable
+
+
+def _select_column(table_alias: str, column_name: str) -> SqlSelectColumn:
+    return SqlSelectColumn(
+        expr=SqlColumnReferenceExpression(SqlColumnReference(table_alias=table_alias, column_name=column_name)),
+        column_alias=column_name,
+    )
+
+
+def _make_nested_select(table_name: str) -> SqlSelectStatementNode:
+    """Returns a SELECT of one column from a sub-query that selects two, so each optimizer has something to do."""
+    return SqlSelectStatementNode(
+        description="outer",
+        select_columns=(_select_column("inner_src", "col0"),),
+        from_source=SqlSelectStatementNode(
+            description="inner",
+            select_columns=(_select_column("table_src", "col0"), _select_column("table_src", "col1")),
+            from_source=SqlTableFromClauseNode(sql_table=SqlTable(schema_name="demo", table_name=table_name)),
+            from_source_alias="table_src",
+        ),
+        from_source_alias="inner_src",
+    )
+
+
+def _optimize_and_render(optimizers: Sequence[SqlQueryPlanOptimizer], sql_node: SqlQueryPlanNode) -> str:
+    for optimizer in optimizers:
+        sql_node = optimizer.optimize(sql_node)
+    return (
+        DefaultSqlQueryPlanRenderer()
+        .render_sql_query_plan(SqlQueryPlan(render_node=sql_node, plan_id=DagId.from_str("plan0")))
+        .sql
+    )
+
+
+@pytest.mark.parametrize("level", tuple(SqlQueryOptimizationLevel))
+@pytest.mark.parametrize("use_column_alias_in_group_by", (False, True))
+def test_optimizers_are_shared_and_stateless(
+    level: SqlQueryOptimizationLevel, use_column_alias_in_group_by: bool
+) -> None:
+    """The optimizers for a level are cached and shared, so check that reusing them does not change the results."""
+    optimizers = SqlQueryOptimizerConfiguration.optimizers_for_level(
+        level, use_column_alias_in_group_by=use_column_alias_in_group_by
+    )
+    assert optimizers is SqlQueryOptimizerConfiguration.optimizers_for_level(
+        level, use_column_alias_in_group_by=use_column_alias_in_group_by
+    )
+
+    optimizer_states = [copy.deepcopy(vars(optimizer)) for optimizer in optimizers]
+    for table_name in ("table_a", "table_b", "table_a"):
+        fresh_optimizers = SqlQueryOptimizerConfiguration.optimizers_for_level.__wrapped__(
+            level, use_column_alias_in_group_by=use_column_alias_in_group_by
+        )
+        assert _optimize_and_render(optimizers, _make_nested_select(table_name)) == _optimize_and_render(
+            fresh_optimizers, _make_nested_select(table_name)
+        )
+    assert [vars(optimizer) for optimizer in optimizers] == optimizer_states